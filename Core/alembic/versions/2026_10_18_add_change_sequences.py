@@ -0,0 +1,80 @@
+"""
+Add per-user change sequences to users and foods for delta sync
+
+Revision ID: 2026_10_18_change_sequences
+Revises: 2026_10_18_foods_history_index
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_change_sequences'
+down_revision = '2026_10_18_foods_history_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS profile_seq BIGINT NOT NULL DEFAULT 0
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE foods
+        ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0
+        """
+    )
+    # Number existing entries per user in insertion order, then start each user's
+    # counter after them; profiles share sequence 0 and ship with the initial sync
+    op.execute(
+        """
+        UPDATE foods
+        SET change_seq = numbered.seq
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY scanned_at, id) AS seq
+            FROM foods
+        ) AS numbered
+        WHERE foods.id = numbered.id AND foods.change_seq = 0
+        """
+    )
+    op.execute(
+        """
+        UPDATE users
+        SET change_seq = counts.max_seq
+        FROM (SELECT user_id, MAX(change_seq) AS max_seq FROM foods GROUP BY user_id) AS counts
+        WHERE users.id = counts.user_id AND users.change_seq < counts.max_seq
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_foods_user_id_change_seq
+        ON foods (user_id, change_seq)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP INDEX IF EXISTS ix_foods_user_id_change_seq
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE foods
+        DROP COLUMN IF EXISTS change_seq
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE users
+        DROP COLUMN IF EXISTS profile_seq,
+        DROP COLUMN IF EXISTS change_seq
+        """
+    )
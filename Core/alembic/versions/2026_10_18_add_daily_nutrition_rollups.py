@@ -0,0 +1,60 @@
+"""
+Add per-user daily nutrition rollups and backfill them from foods
+
+Revision ID: 2026_10_18_daily_nutrition
+Revises: 2026_10_18_products_catalog
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_daily_nutrition'
+down_revision = '2026_10_18_products_catalog'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_nutrition (
+            user_id VARCHAR(36) NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            day DATE NOT NULL,
+            grams DOUBLE PRECISION NOT NULL DEFAULT 0,
+            kcal DOUBLE PRECISION NOT NULL DEFAULT 0,
+            proteins DOUBLE PRECISION NOT NULL DEFAULT 0,
+            carbs DOUBLE PRECISION NOT NULL DEFAULT 0,
+            fats DOUBLE PRECISION NOT NULL DEFAULT 0,
+            entries INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (user_id, day)
+        )
+        """
+    )
+    # Backfill from history; later changes are maintained by the consume path
+    op.execute(
+        """
+        INSERT INTO daily_nutrition (user_id, day, grams, kcal, proteins, carbs, fats, entries)
+        SELECT user_id,
+               date(scanned_at AT TIME ZONE 'UTC'),
+               COALESCE(SUM(grams), 0),
+               COALESCE(SUM(COALESCE(calories_per_100g, 0) * grams / 100.0), 0),
+               COALESCE(SUM(COALESCE(proteins_per_100g, 0) * grams / 100.0), 0),
+               COALESCE(SUM(COALESCE(carbs_per_100g, 0) * grams / 100.0), 0),
+               COALESCE(SUM(COALESCE(fats_per_100g, 0) * grams / 100.0), 0),
+               COUNT(*)
+        FROM foods
+        GROUP BY user_id, date(scanned_at AT TIME ZONE 'UTC')
+        ON CONFLICT (user_id, day) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS daily_nutrition
+        """
+    )
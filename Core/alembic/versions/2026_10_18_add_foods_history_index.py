@@ -0,0 +1,33 @@
+"""
+Add composite (user_id, scanned_at, id) index on foods for keyset-paginated history
+
+Revision ID: 2026_10_18_foods_history_index
+Revises: 2026_10_18_daily_nutrition
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_foods_history_index'
+down_revision = '2026_10_18_daily_nutrition'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_foods_user_id_scanned_at
+        ON foods (user_id, scanned_at, id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP INDEX IF EXISTS ix_foods_user_id_scanned_at
+        """
+    )
@@ -0,0 +1,55 @@
+"""
+Add products catalog table keyed by barcode and backfill it from foods
+
+Revision ID: 2026_10_18_products_catalog
+Revises: 2025_11_03_kcal_general_info
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_products_catalog'
+down_revision = '2025_11_03_kcal_general_info'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            barcode VARCHAR(64) PRIMARY KEY,
+            name VARCHAR(512),
+            calories_per_100g DOUBLE PRECISION,
+            proteins_per_100g DOUBLE PRECISION,
+            carbs_per_100g DOUBLE PRECISION,
+            fats_per_100g DOUBLE PRECISION,
+            source VARCHAR(32),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    # Seed the catalog with the most recently scanned nutrition per barcode
+    op.execute(
+        """
+        INSERT INTO products (barcode, name, calories_per_100g, proteins_per_100g,
+                              carbs_per_100g, fats_per_100g, source)
+        SELECT DISTINCT ON (barcode)
+               barcode, name, calories_per_100g, proteins_per_100g,
+               carbs_per_100g, fats_per_100g, 'consumption'
+        FROM foods
+        ORDER BY barcode, scanned_at DESC
+        ON CONFLICT (barcode) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS products
+        """
+    )
@@ -0,0 +1,39 @@
+"""
+Add pg_trgm GIN index on lower(products.name) for name search
+
+Revision ID: 2026_10_18_products_name_trgm
+Revises: 2026_10_18_change_sequences
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_products_name_trgm'
+down_revision = '2026_10_18_change_sequences'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm
+        """
+    )
+    # Serves both prefix LIKE and word-similarity (<%) matching on the same expression
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_products_name_trgm
+        ON products USING gin (lower(name) gin_trgm_ops)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP INDEX IF EXISTS ix_products_name_trgm
+        """
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from .v1.endpoints import health, auth, food, user, dashboard
+from .v1.endpoints import health, auth, food, user, dashboard, sync
 
 api_router = APIRouter()
 
@@ -9,4 +9,5 @@ api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(food.router, prefix="/food", tags=["food"])
 api_router.include_router(user.router, prefix="/users", tags=["users"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
\ No newline at end of file
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
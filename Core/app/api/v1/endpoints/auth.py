@@ -1,42 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.database import get_db
+from ....core.conditional import conditional_headers, etag_matches, not_modified
+from ....core.database import get_async_db
 from ....schemas.user import UserCreate, UserLogin, UserRead
 from ....schemas.auth import LoginResponse
 from ....services.user_service import UserService
-from ....repositories.user_repository import UserRepository
+from ....repositories.user_repository import AsyncUserRepository
 from ....security.auth import create_access_token, get_current_user
 
 router = APIRouter()
 
 
 def get_user_service() -> UserService:
-    return UserService(repo=UserRepository())
+    return UserService(repo=AsyncUserRepository())
 
 @router.post("/register", response_model=UserRead, summary="Register a new user")
-def register(payload: UserCreate, db: Session = Depends(get_db), service: UserService = Depends(get_user_service)):
-    user = service.register(db, payload)
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_async_db), service: UserService = Depends(get_user_service)):
+    user = await service.register(db, payload)
     return UserRead.model_validate(user)
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: UserLogin, db: Session = Depends(get_db), service: UserService = Depends(get_user_service)):
-    print("Login payload:", payload.dict())
-    try:
-        user = service.authenticate(db, payload.email, payload.password)
-        print("Authenticated user:", user)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
-        token = create_access_token(subject=user.id)
-        user_out = UserRead.model_validate(user)
-        print("User output:", user_out)
-        return LoginResponse(access_token=token, user=user_out)
-    except Exception as e:
-        print("Login error:", e)
-        raise
+async def login(payload: UserLogin, db: AsyncSession = Depends(get_async_db), service: UserService = Depends(get_user_service)):
+    user = await service.authenticate(db, payload.email, payload.password)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    token = create_access_token(subject=user.id)
+    return LoginResponse(access_token=token, user=UserRead.model_validate(user))
 
 @router.get("/me", response_model=UserRead, summary="Get current user (protected)")
-async def get_me(current_user=Depends(get_current_user)):
+async def get_me(request: Request, response: Response, current_user=Depends(get_current_user)):
+    headers = conditional_headers(current_user.etag, "private, no-cache")
+    if etag_matches(request, current_user.etag):
+        return not_modified(headers)
+    response.headers.update(headers)
     return current_user
 
 
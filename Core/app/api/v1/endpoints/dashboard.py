@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ....core.database import get_async_db
+from ....core.responses import respond
+from ....schemas.dashboard import DashboardResponse
 from ....security.auth import get_current_user
+from ....services.dashboard_service import DashboardService
 
 router = APIRouter()
 
 
-@router.get("", summary="Dashboard entry point: returns onboarding requirement")
-async def dashboard(current_user=Depends(get_current_user)):
-    return {"show_onboarding": not bool(getattr(current_user, "is_onboarded", False))}
+def get_dashboard_service() -> DashboardService:
+    return DashboardService()
+
+
+@router.get("", response_model=DashboardResponse, summary="Home screen: onboarding flag, today's intake vs. goal, recent entries")
+async def dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    service: DashboardService = Depends(get_dashboard_service),
+    current_user=Depends(get_current_user),
+):
+    # Profile fields come from the (cached) principal, so profile updates show up as soon
+    # as the principal is invalidated; the intake snapshot only needs the database on a miss
+    return respond(DashboardResponse, await service.summary(db, current_user))
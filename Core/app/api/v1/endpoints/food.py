@@ -1,39 +1,160 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ....core.database import get_db
+from ....core.conditional import conditional_headers, etag_matches, make_etag, not_modified
+from ....core.config import get_settings
+from ....core.database import get_async_db, get_db
+from ....core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from ....core.responses import respond, respond_json
 from ....schemas.food import (
     FoodLookupRequest,
     FoodLookupResponse,
     FoodConsumeRequest,
+    FoodConsumeBatchRequest,
+    FoodListResponse,
     FoodRead,
+    FoodSearchResponse,
+    NutritionSeriesResponse,
 )
+from ....services.export_service import MEDIA_TYPES, ExportFormat, ExportService
 from ....services.food_service import FoodService
-from ....repositories.food_repository import FoodRepository
+from ....repositories.food_repository import AsyncFoodRepository, FoodRepository
 from ....security.auth import get_current_user
 
 router = APIRouter()
 
 
 def get_food_service() -> FoodService:
-    return FoodService(FoodRepository())
+    return FoodService(AsyncFoodRepository())
+
+
+def get_food_repository() -> FoodRepository:
+    return FoodRepository()
 
 
 @router.post("/lookup", response_model=FoodLookupResponse, summary="Lookup a food by barcode")
-def lookup_food(payload: FoodLookupRequest, db: Session = Depends(get_db), service: FoodService = Depends(get_food_service)):
-    food, source = service.lookup_by_barcode(db, payload.barcode)
+async def lookup_food(payload: FoodLookupRequest, db: AsyncSession = Depends(get_async_db), service: FoodService = Depends(get_food_service)):
+    food, source = await service.lookup_by_barcode(db, payload.barcode)
     return {"food": food, "source": source}
 
 
+@router.get("/lookup/{barcode}", response_model=FoodLookupResponse, summary="Lookup a food by barcode (cacheable)")
+async def lookup_food_get(
+    barcode: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    service: FoodService = Depends(get_food_service),
+):
+    food, source = await service.lookup_by_barcode(db, barcode)
+    if food is None:
+        return {"food": None, "source": source}
+    # The body names its source, so the tag covers it as well as the product version
+    max_age = get_settings().PRODUCT_LOOKUP_MAX_AGE_SECONDS
+    headers = conditional_headers(make_etag(food.etag, source), f"public, max-age={max_age}")
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return respond(FoodLookupResponse, {"food": food, "source": source}, headers=headers)
+
+
+@router.get("/search", response_model=FoodSearchResponse, summary="Search the product catalog by name (prefix and fuzzy, ranked)")
+async def search_food(
+    q: str = Query(min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    service: FoodService = Depends(get_food_service),
+):
+    return {"items": await service.catalog.search(db, q, limit=limit)}
+
+
 @router.post("/consume", response_model=FoodRead, summary="Record consumed grams for a food by barcode (single-table)")
-def consume_food(payload: FoodConsumeRequest, db: Session = Depends(get_db), service: FoodService = Depends(get_food_service), current_user=Depends(get_current_user)):
-    created = service.consume(db, user_id=current_user.id, barcode=payload.barcode, grams=payload.grams)
-    return created
+async def consume_food(payload: FoodConsumeRequest, db: AsyncSession = Depends(get_async_db), service: FoodService = Depends(get_food_service), current_user=Depends(get_current_user)):
+    created = await service.consume(db, user_id=current_user.id, barcode=payload.barcode, grams=payload.grams)
+    return respond(FoodRead, created)
+
+
+@router.post("/consume/batch", response_model=FoodListResponse, summary="Record several consumed foods in one transaction")
+async def consume_food_batch(payload: FoodConsumeBatchRequest, db: AsyncSession = Depends(get_async_db), service: FoodService = Depends(get_food_service), current_user=Depends(get_current_user)):
+    created = await service.consume_many(
+        db, user_id=current_user.id, items=[(item.barcode, item.grams) for item in payload.items]
+    )
+    return respond(FoodListResponse, {"items": created})
+
+
+@router.get("/totals", summary="Consumed totals for the current user, optionally within a date range (UTC days)")
+def get_totals(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    food_repo: FoodRepository = Depends(get_food_repository),
+    current_user=Depends(get_current_user),
+):
+    totals = food_repo.totals_by_user(db, user_id=current_user.id, date_from=date_from, date_to=date_to)
+    return respond_json(totals)
+
+
+@router.get("/series", response_model=NutritionSeriesResponse, summary="Nutrition totals per day, week or month (UTC)")
+def get_series(
+    bucket: Literal["day", "week", "month"] = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    food_repo: FoodRepository = Depends(get_food_repository),
+    current_user=Depends(get_current_user),
+):
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to")
+    items = food_repo.series_by_user(
+        db, user_id=current_user.id, bucket=bucket, date_from=date_from, date_to=date_to
+    )
+    return respond(
+        NutritionSeriesResponse, {"bucket": bucket, "date_from": date_from, "date_to": date_to, "items": items}
+    )
+
+
+@router.get("/history", response_model=FoodListResponse, summary="Consumption entries of the current user, newest first (cursor-paginated)")
+def get_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    food_repo: FoodRepository = Depends(get_food_repository),
+    current_user=Depends(get_current_user),
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    items, next_key = food_repo.history_by_user(
+        db, user_id=current_user.id, limit=limit, after=after, date_from=date_from, date_to=date_to
+    )
+    return respond(FoodListResponse, {"items": items, "next_cursor": encode_cursor(*next_key) if next_key else None})
 
 
-@router.get("/totals")
-def get_totals(db: Session = Depends(get_db), service: FoodService = Depends(get_food_service), current_user=Depends(get_current_user)):
-    totals = service.food_repo.totals_by_user(db, user_id=current_user.id)
-    return totals
+@router.get("/export", summary="Stream all consumption entries of the current user as CSV or NDJSON")
+async def export_history(
+    format: ExportFormat = "csv",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    compress: bool = Query(False, description="gzip the file"),
+    current_user=Depends(get_current_user),
+):
+    # No request-scoped session: the export opens its own while the body streams
+    body = ExportService().stream(
+        user_id=current_user.id, fmt=format, date_from=date_from, date_to=date_to, compress=compress
+    )
+    filename = f"consumption.{format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if compress else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
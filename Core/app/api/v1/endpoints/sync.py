@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....core.database import get_async_db
+from ....repositories.food_repository import AsyncFoodRepository
+from ....repositories.user_repository import AsyncUserRepository
+from ....schemas.sync import SyncRequest, SyncResponse
+from ....security.auth import get_current_user
+from ....services.food_service import FoodService
+from ....services.sync_service import SyncService
+
+router = APIRouter()
+
+
+def get_sync_service() -> SyncService:
+    food_repo = AsyncFoodRepository()
+    return SyncService(FoodService(food_repo), food_repo, AsyncUserRepository())
+
+
+@router.post("", response_model=SyncResponse, summary="Upload offline entries and fetch changes since a cursor")
+async def sync(
+    payload: SyncRequest,
+    db: AsyncSession = Depends(get_async_db),
+    service: SyncService = Depends(get_sync_service),
+    current_user=Depends(get_current_user),
+):
+    uploaded = await service.upload(db, user_id=current_user.id, entries=payload.entries)
+    # Uploaded entries come back in ``entries`` with their server-side sequence
+    changes = await service.changes(db, user_id=current_user.id, cursor=payload.cursor, limit=payload.limit)
+    return {**changes, **uploaded}
@@ -1,27 +1,42 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.database import get_db
+from ....core.conditional import conditional_headers, etag_matches, not_modified
+from ....core.database import get_async_db
+from ....core.responses import respond
 from ....schemas.user import UserRead, UserUpdateOnboarding, UserOnboardingUpdate
 from ....security.auth import get_current_user
-from ....repositories.user_repository import UserRepository
+from ....security.principal import Principal
+from ....repositories.user_repository import AsyncUserRepository
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserRead, summary="Get current user")
-async def read_me(current_user=Depends(get_current_user)):
-    return current_user
+async def read_me(request: Request, response: Response, current_user=Depends(get_current_user)):
+    headers = conditional_headers(current_user.etag, "private, no-cache")
+    if etag_matches(request, current_user.etag):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return respond(UserRead, current_user, headers=headers)
 
 
 @router.patch("/me", response_model=UserRead, summary="Update current user onboarding data")
 async def update_me_onboarding(
     payload: UserOnboardingUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    repo = UserRepository()
-    user = repo.update_onboarding(db, current_user, **payload.model_dump(exclude_unset=True))
-    return user
+    repo = AsyncUserRepository()
+    # current_user is a cached snapshot; modify the persistent row
+    user = await repo.get_by_id(db, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user = await repo.update_onboarding(db, user, **payload.model_dump(exclude_unset=True))
+    # Validator of the new state, so the next GET /me can be conditional right away
+    headers = conditional_headers(Principal.from_user(user).etag)
+    response.headers.update(headers)
+    return respond(UserRead, user, headers=headers)
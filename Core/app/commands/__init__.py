@@ -0,0 +1 @@
+# Management commands, run as modules, e.g. `python -m Core.app.commands.rebuild_rollups`.
@@ -0,0 +1,79 @@
+"""Stream an OpenFoodFacts product dump (JSONL or CSV/TSV, optionally gzipped) into the products table.
+
+Usage (from the repo root):
+    python -m Core.app.commands.import_openfoodfacts openfoodfacts-products.jsonl.gz
+    python -m Core.app.commands.import_openfoodfacts en.openfoodfacts.org.products.csv.gz --offset 1200000
+
+Each chunk is committed on its own; after an interruption, rerun with the
+``--offset`` printed by the last progress line.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict
+
+from ..core.database import SessionLocal, engine
+from ..models.product import Product
+from ..repositories.product_repository import ProductRepository
+from ..services.openfoodfacts_dump import detect_format, iter_dump
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="dump file, or - for stdin (requires --format)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="dump format (default: from file name)")
+    parser.add_argument("--offset", type=int, default=0, help="number of records to skip (resume point)")
+    parser.add_argument("--limit", type=int, help="stop after this many records")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="products per upsert/commit (default: 5000)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    Product.__table__.create(bind=engine, checkfirst=True)
+    repo = ProductRepository()
+
+    started = time.perf_counter()
+    position = args.offset
+    imported = skipped = 0
+    # Keyed by barcode: a chunk must not upsert the same row twice (Postgres rejects it)
+    chunk: Dict[str, Dict[str, Any]] = {}
+
+    def flush() -> None:
+        nonlocal imported
+        with SessionLocal() as db:
+            imported += repo.bulk_upsert(db, list(chunk.values()))
+        chunk.clear()
+        elapsed = time.perf_counter() - started
+        print(
+            f"… {position - args.offset:,} record(s) read, {imported:,} upserted, {skipped:,} skipped "
+            f"({(position - args.offset) / elapsed if elapsed else 0:,.0f}/s) - resume with --offset {position}",
+            flush=True,
+        )
+
+    for info in iter_dump(args.path, fmt, offset=args.offset):
+        if args.limit is not None and position - args.offset >= args.limit:
+            break
+        position += 1
+        if info is None:
+            skipped += 1
+            continue
+        chunk[info.barcode] = {
+            "barcode": info.barcode,
+            "name": info.name,
+            "calories_per_100g": info.calories_per_100g,
+            "proteins_per_100g": info.proteins_per_100g,
+            "carbs_per_100g": info.carbs_per_100g,
+            "fats_per_100g": info.fats_per_100g,
+            "source": "openfoodfacts",
+        }
+        if len(chunk) >= args.chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    print(f"✅ Imported {imported:,} product(s) from {position - args.offset:,} record(s) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+"""Bootstrap the schema and run Alembic migrations as a release step.
+
+Usage (from the repo root):
+    python -m Core.app.commands.migrate          # migrate to head (waits for a concurrent run)
+    python -m Core.app.commands.migrate --check  # exit 1 if migrations are pending
+
+Pair with RUN_MIGRATIONS_ON_STARTUP=false so app workers never migrate themselves.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from ..core.database import engine
+from ..migration.coordinator import build_coordinator
+from ..migration.migration import migration_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only report whether migrations are pending")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        with engine.connect() as connection:
+            up_to_date = migration_service.is_up_to_date(connection)
+        print("✅ Schema is up to date" if up_to_date else "❌ Migrations pending")
+        return 0 if up_to_date else 1
+
+    started = time.perf_counter()
+    outcome = build_coordinator().run()
+    print(f"✅ Schema {outcome} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
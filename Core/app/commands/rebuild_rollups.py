@@ -0,0 +1,33 @@
+"""Rebuild the per-user daily nutrition rollups from the raw consumption rows.
+
+Usage (from the repo root):
+    python -m Core.app.commands.rebuild_rollups              # all users
+    python -m Core.app.commands.rebuild_rollups --user-id ID # a single user
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from ..core.database import SessionLocal, engine
+from ..models import user as _user_model  # noqa: F401
+from ..models import food as _food_model  # noqa: F401
+from ..models.daily_nutrition import DailyNutrition
+from ..repositories.nutrition_rollup_repository import NutritionRollupRepository
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", help="only rebuild rollups of this user")
+    args = parser.parse_args(argv)
+
+    DailyNutrition.__table__.create(bind=engine, checkfirst=True)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        rows = NutritionRollupRepository().rebuild(db, user_id=args.user_id)
+    print(f"✅ Rebuilt {rows} daily rollup row(s) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Mapping, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong entity tag over the given values (e.g. a record's fields incl. its updated_at)."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match names ``etag`` (weak comparison, RFC 9110 13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def not_modified(headers: Mapping[str, str]) -> Response:
+    """304 carrying the validators and caching headers of the 200 it stands for; no body."""
+    return Response(status_code=304, headers=dict(headers))
+
+
+def conditional_headers(etag: str, cache_control: Optional[str] = None) -> dict:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
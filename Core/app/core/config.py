@@ -16,10 +16,93 @@ class Settings:
         "sqlite:///./insho.db",
     )
 
+    # Connection pools (per engine and per worker process). Pre-ping tests each connection on
+    # checkout (one extra round-trip); without it stale connections are dropped on first error
+    # and DB_POOL_RECYCLE_SECONDS bounds their age (-1 = never recycle).
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # psycopg server-side prepared statements: prepare a query after N executions on a
+    # connection ("0" = always); "off" disables them (PgBouncer transaction pooling);
+    # empty keeps the driver default
+    DB_PREPARE_THRESHOLD: str = os.getenv("DB_PREPARE_THRESHOLD", "")
+
+    # Schema bootstrap + Alembic upgrade on app startup. Disable when migrations run as a
+    # separate release step (python -m Core.app.commands.migrate).
+    RUN_MIGRATIONS_ON_STARTUP: bool = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+    # How long a worker waits for another process to finish migrating
+    MIGRATION_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("MIGRATION_LOCK_TIMEOUT_SECONDS", "300"))
+
+    # Prometheus metrics at /metrics (request, SQL, pool and upstream timings)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # SQLite "production" profile: WAL + tuned pragmas, one serialized writer connection
+    # and a pool of read-only connections (ignored for Postgres and in-memory SQLite)
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "default")  # "default" | "production"
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KIB: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    # Opt-in SQL diagnostics: log statements slower than the threshold (with the originating
+    # repository method, optionally EXPLAIN) and requests repeating a statement > N times (N+1)
+    SQL_DIAGNOSTICS_ENABLED: bool = os.getenv("SQL_DIAGNOSTICS_ENABLED", "false").lower() in ("1", "true", "yes")
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() in ("1", "true", "yes")
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
     # JWT configuration
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "dev-insecure-change-me")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    # Password hashing (pbkdf2_sha256): cost and a dedicated, bounded executor.
+    # Hashes with a different cost are rehashed transparently on the next login.
+    PASSWORD_HASH_ROUNDS: int = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" | "process"
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))  # 0 = min(4, CPUs)
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    # Cache of verified principals so authenticated requests skip the user lookup.
+    # Invalidation is per process; the TTL bounds staleness across workers.
+    PRINCIPAL_CACHE_MAXSIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAXSIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+    # In-process product catalog cache (barcode -> nutrition)
+    PRODUCT_CACHE_MAXSIZE: int = int(os.getenv("PRODUCT_CACHE_MAXSIZE", "10000"))
+    PRODUCT_CACHE_TTL_SECONDS: float = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "3600"))
+    # Barcodes unknown to OpenFoodFacts are remembered for a shorter time
+    PRODUCT_NEGATIVE_CACHE_MAXSIZE: int = int(os.getenv("PRODUCT_NEGATIVE_CACHE_MAXSIZE", "10000"))
+    PRODUCT_NEGATIVE_CACHE_TTL_SECONDS: float = float(os.getenv("PRODUCT_NEGATIVE_CACHE_TTL_SECONDS", "600"))
+    # Cache-Control max-age of GET /food/lookup/{barcode}; clients revalidate with the ETag after it
+    PRODUCT_LOOKUP_MAX_AGE_SECONDS: int = int(os.getenv("PRODUCT_LOOKUP_MAX_AGE_SECONDS", "3600"))
+
+    # Opt-in fast JSON path for hot endpoints: response models are validated and dumped to
+    # bytes by cached pydantic TypeAdapters, plain dict payloads are encoded with orjson
+    FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+    # Opt-in group commit for /food/consume: inserts are queued and written as one multi-row
+    # INSERT + commit per batch (after the delay or once the batch is full); every request
+    # is answered only after its batch has committed
+    CONSUME_WRITE_BEHIND: bool = os.getenv("CONSUME_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+    CONSUME_BATCH_MAX_SIZE: int = int(os.getenv("CONSUME_BATCH_MAX_SIZE", "200"))
+    CONSUME_BATCH_MAX_DELAY_MS: float = float(os.getenv("CONSUME_BATCH_MAX_DELAY_MS", "5"))
+
+    # Per-user dashboard snapshots (today's intake + recent entries), updated in place by
+    # consumes in this process; the TTL bounds staleness across workers
+    DASHBOARD_CACHE_MAXSIZE: int = int(os.getenv("DASHBOARD_CACHE_MAXSIZE", "10000"))
+    DASHBOARD_CACHE_TTL_SECONDS: float = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+    DASHBOARD_RECENT_ITEMS: int = int(os.getenv("DASHBOARD_RECENT_ITEMS", "5"))
+
+    # Upstream OpenFoodFacts API (point OPENFOODFACTS_BASE_URL at a local stub for testing)
+    OPENFOODFACTS_BASE_URL: str = os.getenv("OPENFOODFACTS_BASE_URL", "https://world.openfoodfacts.org")
+    OPENFOODFACTS_TIMEOUT_SECONDS: float = float(os.getenv("OPENFOODFACTS_TIMEOUT_SECONDS", "7"))
+    OPENFOODFACTS_MAX_CONNECTIONS: int = int(os.getenv("OPENFOODFACTS_MAX_CONNECTIONS", "20"))
+    OPENFOODFACTS_MAX_IN_FLIGHT: int = int(os.getenv("OPENFOODFACTS_MAX_IN_FLIGHT", "10"))
+    # Circuit breaker: open after N consecutive failures, probe again after the recovery time
+    OPENFOODFACTS_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("OPENFOODFACTS_BREAKER_FAILURE_THRESHOLD", "5"))
+    OPENFOODFACTS_BREAKER_RECOVERY_SECONDS: float = float(os.getenv("OPENFOODFACTS_BREAKER_RECOVERY_SECONDS", "30"))
+    OPENFOODFACTS_BREAKER_PROBE_CALLS: int = int(os.getenv("OPENFOODFACTS_BREAKER_PROBE_CALLS", "1"))
 
     # SuperTokens configuration (legacy; safe to ignore if not used)
     SUPERTOKENS_CONNECTION_URI: str = os.getenv(
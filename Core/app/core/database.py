@@ -1,9 +1,12 @@
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
 from .config import get_settings
+from .db_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine, pool_snapshot, register_pool_gauges
 
 # Load settings at once (lru_cache ensures a single instance)
 _settings = get_settings()
@@ -18,34 +21,188 @@ def _normalize_database_url(url: str) -> str:
     return url
 
 
+def _async_database_url(url: str) -> str:
+    # Async drivers: psycopg (psycopg3) serves both sync and async; SQLite needs aiosqlite
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+psycopg://" + url[len("postgresql+psycopg2://"):]
+    return url
+
+
 DATABASE_URL = _normalize_database_url(_settings.DATABASE_URL)
+ASYNC_DATABASE_URL = _async_database_url(DATABASE_URL)
 
 # Für SQLite ist ein spezielles connect_arg nötig, damit FastAPI/Uvicorn (mehrere Threads) funktioniert.
 # Hintergrund: Der SQLite-Treiber erlaubt standardmäßig nur die Nutzung der Verbindung im selben Thread.
 _is_sqlite = DATABASE_URL.startswith("sqlite")
 
 # SQLAlchemy-Engine erstellen; connect_args nur für SQLite setzen.
-_engine_kwargs = {
+_engine_kwargs: Dict[str, Any] = {
     "echo": False,
-    "future": True,
-    "pool_pre_ping": True,
+    "pool_pre_ping": _settings.DB_POOL_PRE_PING,
 }
+_connect_args: Dict[str, Any] = {}
 if _is_sqlite:
-    _engine_kwargs["connect_args"] = {"check_same_thread": False}
+    _connect_args["check_same_thread"] = False
+
+
+def _prepare_threshold(value: str) -> Any:
+    # "" -> driver default, "off"/"none" -> never prepare, else prepare after N executions
+    if value.strip().lower() in ("off", "none", "false"):
+        return None
+    return int(value)
+
+
+if make_url(DATABASE_URL).drivername == "postgresql+psycopg" and _settings.DB_PREPARE_THRESHOLD.strip():
+    _connect_args["prepare_threshold"] = _prepare_threshold(_settings.DB_PREPARE_THRESHOLD)
+
+# Queue pools that record checkout wait (in-memory SQLite keeps its single-connection pool)
+_is_memory = _is_sqlite and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/").endswith(":"))
+_pool_kwargs: Dict[str, Any] = {}
+if not _is_memory:
+    _pool_kwargs = {
+        "pool_size": _settings.DB_POOL_SIZE,
+        "max_overflow": _settings.DB_MAX_OVERFLOW,
+        "pool_timeout": _settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": _settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+# Produktions-Profil für SQLite: WAL + Pragmas, genau eine Schreibverbindung pro Engine
+# (Schreiber warten im Pool statt auf SQLITE_BUSY) und ein Pool lesender Verbindungen.
+# `engine`/`async_engine` sind dann die Schreib-Engines (Migrationen, Kommandos, create_all).
+_sqlite_production = _is_sqlite and not _is_memory and _settings.SQLITE_PROFILE == "production"
+if _sqlite_production:
+    _reader_pool = {**_pool_kwargs, "pool_size": _settings.SQLITE_READ_POOL_SIZE, "max_overflow": 0}
+    _pool_kwargs = {**_pool_kwargs, "pool_size": 1, "max_overflow": 0}
 
 engine = create_engine(
     DATABASE_URL,
+    future=True,
+    connect_args=_connect_args,
     **_engine_kwargs,
+    **({} if _is_memory else {"poolclass": TimedQueuePool, **_pool_kwargs}),
 )
 
-# Session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    future=True,
+# Async engine for `async def` endpoints, so DB I/O never blocks the event loop.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=_connect_args,
+    **_engine_kwargs,
+    **({} if _is_memory else {"poolclass": TimedAsyncAdaptedQueuePool, **_pool_kwargs}),
 )
 
+if _sqlite_production:
+    from .sqlite_profile import RoutingSession, apply_pragmas
+
+    read_engine = create_engine(
+        DATABASE_URL,
+        future=True,
+        connect_args=_connect_args,
+        poolclass=TimedQueuePool,
+        **_engine_kwargs,
+        **_reader_pool,
+    )
+    async_read_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=_connect_args,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **_engine_kwargs,
+        **_reader_pool,
+    )
+    for _tuned, _read_only in (
+        (engine, False),
+        (read_engine, True),
+        (async_engine.sync_engine, False),
+        (async_read_engine.sync_engine, True),
+    ):
+        apply_pragmas(
+            _tuned,
+            busy_timeout_ms=_settings.SQLITE_BUSY_TIMEOUT_MS,
+            cache_size_kib=_settings.SQLITE_CACHE_SIZE_KIB,
+            mmap_size=_settings.SQLITE_MMAP_SIZE,
+            read_only=_read_only,
+        )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+# Statement counts/timings for /metrics (async engines emit events on their sync core)
+_instrumented = {"sync": engine, "async": async_engine.sync_engine}
+if _sqlite_production:
+    _instrumented.update({"sync_read": read_engine, "async_read": async_read_engine.sync_engine})
+for _label, _instrumented_engine in _instrumented.items():
+    instrument_engine(_instrumented_engine, _label)
+register_pool_gauges(_instrumented)
+
+
+def _configured_pool(pool_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Reported from the settings the pools were built with (QueuePool keeps them private)
+    if not pool_kwargs:
+        return {}
+    return {
+        "max_overflow": pool_kwargs["max_overflow"],
+        "recycle": pool_kwargs["pool_recycle"],
+        "pre_ping": _settings.DB_POOL_PRE_PING,
+    }
+
+
+_pool_config = {label: _configured_pool(_pool_kwargs) for label in ("sync", "async")}
+if _sqlite_production:
+    _pool_config.update({label: _configured_pool(_reader_pool) for label in ("sync_read", "async_read")})
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-engine pool sizing and usage of this worker process (health endpoint)."""
+    return {label: {**pool_snapshot(pooled), **_pool_config[label]} for label, pooled in _instrumented.items()}
+
+
+if _settings.SQL_DIAGNOSTICS_ENABLED:
+    from .query_diagnostics import install_query_diagnostics
+
+    for _diagnosed in _instrumented.values():
+        install_query_diagnostics(
+            _diagnosed,
+            slow_threshold=_settings.SLOW_QUERY_THRESHOLD_MS / 1000.0,
+            repeat_threshold=_settings.N_PLUS_ONE_THRESHOLD,
+            explain=_settings.SLOW_QUERY_EXPLAIN,
+        )
+
+# Session factories. expire_on_commit=False: committed objects keep their state instead of
+# being reloaded by a SELECT on next access; async sessions must not lazy-load (implicit I/O)
+# anyway. Server-generated values (timestamps, onupdate) arrive with the INSERT/UPDATE via
+# RETURNING (eager_defaults on the models; a follow-up SELECT on dialects without it).
+if _sqlite_production:
+    SessionLocal = sessionmaker(
+        class_=RoutingSession,
+        writer=engine,
+        reader=read_engine,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        future=True,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        sync_session_class=RoutingSession,
+        writer=async_engine.sync_engine,
+        reader=async_read_engine.sync_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine,
+        future=True,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 # Base class for models
 Base = declarative_base()
 
@@ -61,3 +218,22 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an SQLAlchemy AsyncSession.
+    Usage:
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def upsert_insert(dialect_name: str) -> Optional[Callable[..., Any]]:
+    """Return the dialect-specific ``insert`` supporting ON CONFLICT, or None if unsupported."""
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
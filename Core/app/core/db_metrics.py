@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .metrics import counter, gauge_function, histogram
+
+DB_QUERIES = counter("insho_db_queries_total", "SQL statements executed.", ("engine",))
+DB_QUERY_SECONDS = counter("insho_db_query_seconds_total", "Time spent executing SQL statements.", ("engine",))
+POOL_CHECKOUT_SECONDS = histogram(
+    "insho_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection.",
+    ("engine",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# Per-request [statements, seconds]; set by the metrics middleware, shared with threadpool
+# workers because anyio copies the context into them
+request_queries: ContextVar[Optional[List[float]]] = ContextVar("request_queries", default=None)
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Count statements and their execution time, globally and for the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        DB_QUERIES.inc(label)
+        DB_QUERY_SECONDS.inc(label, amount=elapsed)
+        current = request_queries.get()
+        if current is not None:
+            current[0] += 1
+            current[1] += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):  # noqa: ANN001
+        # Keep the start-time stack balanced when a statement fails
+        stack = context.connection.info.get("query_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    metrics_label = "sync"
+
+    def _do_get(self):  # noqa: ANN202
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, self.metrics_label)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+    def _do_get(self):  # noqa: ANN202
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, self.metrics_label)
+
+
+def pool_snapshot(engine: Engine) -> Dict[str, Any]:
+    """Current usage of the engine's pool, for the health endpoint and the gauges."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+    }
+
+
+def register_pool_gauges(engines: Dict[str, Engine]) -> None:
+    """Expose checked-out and idle connections of the engines' queue pools."""
+
+    def read() -> Dict[tuple, float]:
+        values: Dict[tuple, float] = {}
+        for label, engine in engines.items():
+            snapshot = pool_snapshot(engine)
+            if "checked_out" in snapshot:
+                values[(label, "checked_out")] = snapshot["checked_out"]
+                values[(label, "idle")] = snapshot["idle"]
+        return values
+
+    gauge_function("insho_db_pool_connections", "Pooled database connections by state.", read, ("engine", "state"))
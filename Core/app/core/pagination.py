@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client-supplied pagination cursor cannot be decoded."""
+
+
+def encode_cursor(scanned_at: datetime, id_: str) -> str:
+    """Opaque, URL-safe keyset cursor pointing at the last row of a page."""
+    raw = f"{scanned_at.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        stamp, id_ = raw.split("|", 1)
+        return datetime.fromisoformat(stamp), id_
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor("invalid cursor") from e
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import re
+import sys
+import time
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import Engine, event
+
+try:
+    import greenlet
+except ImportError:  # only needed to see through the async engine's greenlet bridge
+    greenlet = None  # type: ignore[assignment]
+
+logger = logging.getLogger("insho.sql")
+
+# Package of the application (e.g. "Core.app") and of the repository layer
+_APP_PACKAGE = __name__.rsplit(".core.", 1)[0]
+_REPOSITORY_PACKAGE = f"{_APP_PACKAGE}.repositories."
+
+# Per-request statement counters, set by QueryDiagnosticsMiddleware
+_request_statements: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar("request_statements", default=None)
+
+
+def _frames(frame: Optional[FrameType]) -> Iterator[FrameType]:
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    if greenlet is None:
+        return
+    # Async engine: the driver call runs in a child greenlet; the awaiting
+    # repository coroutine is on the parent greenlet's suspended stack
+    parent = greenlet.getcurrent().parent
+    while parent is not None:
+        frame = parent.gr_frame
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        parent = parent.parent
+
+
+def _frame_name(frame: FrameType) -> str:
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+def originating_method() -> str:
+    """Innermost repository method on the call stack (else the innermost app frame)."""
+    fallback = None
+    for frame in _frames(sys._getframe(1)):
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_REPOSITORY_PACKAGE):
+            return _frame_name(frame)
+        if fallback is None and module.startswith(_APP_PACKAGE) and module != __name__:
+            fallback = _frame_name(frame)
+    return fallback or "<unknown>"
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Names and types of the bound parameters, never their values."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else None
+        return f"{len(parameters)} x {parameter_shape(first, False)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_value_shape(value) for value in parameters) + ")"
+    return "none" if parameters is None else type(parameters).__name__
+
+
+def _one_line(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:  # noqa: ANN001
+    if not re.match(r"\s*(SELECT|WITH)\b", statement, re.IGNORECASE):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    conn.info["diagnostics_explaining"] = True
+    try:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    except Exception as e:  # diagnostics must never break the request
+        return f"<EXPLAIN failed: {e}>"
+    finally:
+        conn.info["diagnostics_explaining"] = False
+    return "\n".join(" | ".join(str(col) for col in row) for row in rows)
+
+
+def install_query_diagnostics(
+    engine: Engine,
+    *,
+    slow_threshold: float,
+    repeat_threshold: int,
+    explain: bool = False,
+) -> None:
+    """Log statements slower than ``slow_threshold`` seconds and count statement templates per request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        conn.info.setdefault("diagnostics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        elapsed = time.perf_counter() - conn.info["diagnostics_started"].pop()
+        if conn.info.get("diagnostics_explaining"):
+            return
+
+        counts = _request_statements.get()
+        if counts is not None:
+            entry = counts.setdefault(statement, {"count": 0, "origin": None})
+            entry["count"] += 1
+            if entry["count"] == repeat_threshold + 1:
+                # Walk the stack once, when the template first crosses the threshold
+                entry["origin"] = originating_method()
+
+        if elapsed >= slow_threshold:
+            message = "Slow query (%.1f ms) in %s: %s -- params %s"
+            args = [elapsed * 1000.0, originating_method(), _one_line(statement), parameter_shape(parameters, executemany)]
+            if explain and not executemany:
+                plan = _explain(conn, statement, parameters)
+                if plan:
+                    message += "\n%s"
+                    args.append(plan)
+            logger.warning(message, *args)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):  # noqa: ANN001
+        stack = context.connection.info.get("diagnostics_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+
+
+class QueryDiagnosticsMiddleware:
+    """Flags requests that run the same statement template more than ``repeat_threshold`` times (N+1)."""
+
+    def __init__(self, app, repeat_threshold: int = 10) -> None:  # noqa: ANN001
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send) -> None:  # noqa: ANN001
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counts: Dict[str, Dict[str, Any]] = {}
+        token = _request_statements.set(counts)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_statements.reset(token)
+            for statement, entry in counts.items():
+                if entry["count"] > self.repeat_threshold:
+                    logger.warning(
+                        "Possible N+1: %s %s ran the same statement %d times (from %s): %s",
+                        scope["method"],
+                        scope["path"],
+                        entry["count"],
+                        entry["origin"] or "<unknown>",
+                        _one_line(statement),
+                    )
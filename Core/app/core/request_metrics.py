@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from .db_metrics import request_queries
+from .metrics import counter, gauge, histogram
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]], Awaitable[None]]
+
+REQUESTS = counter("insho_http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status"))
+REQUEST_SECONDS = histogram("insho_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+IN_FLIGHT = gauge("insho_http_requests_in_flight", "HTTP requests currently being served.")
+REQUEST_DB_QUERIES = histogram(
+    "insho_http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_SECONDS = histogram("insho_http_request_db_seconds", "SQL execution time per HTTP request.", ("route",))
+
+
+def route_label(scope: Scope) -> str:
+    """Path template of the matched route (e.g. /api/v1/food/lookup), or ``<unmatched>``."""
+    path = getattr(scope.get("route"), "path", None)
+    if path is None:
+        return "<unmatched>"
+    # Recent FastAPI versions match the included router's own routes and keep the
+    # include prefix in scope["fastapi"]; older ones store the full path on the route
+    included = (scope.get("fastapi") or {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "") or ""
+    return path if path.startswith(prefix) else prefix + path
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware body buffering) recording per-route metrics.
+
+    Routes are labelled by their path template, so path parameters do not create
+    new series; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive, send) -> None:  # noqa: ANN001
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        queries = [0, 0.0]
+        token = request_queries.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            request_queries.reset(token)
+            label = route_label(scope)
+            method = scope["method"]
+            REQUESTS.inc(method, label, str(status_code))
+            REQUEST_SECONDS.observe(elapsed, method, label)
+            REQUEST_DB_QUERIES.observe(queries[0], label)
+            REQUEST_DB_SECONDS.observe(queries[1], label)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+from .config import get_settings
+
+try:
+    import orjson
+except ImportError:  # listed in requirements; without it FastJSONResponse uses the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger("insho.responses")
+
+_settings = get_settings()
+
+if _settings.FAST_JSON_RESPONSES and orjson is None:
+    logger.warning("FAST_JSON_RESPONSES is enabled but orjson is not installed; encoding with the stdlib json module")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoding with orjson (dates, datetimes, UUIDs and dataclasses natively).
+
+    Meant for returning plain dict payloads directly, which skips FastAPI's
+    ``jsonable_encoder`` pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model_type: Any) -> TypeAdapter:
+    """Process-wide TypeAdapter per response type; building one compiles its validator and serializer."""
+    return TypeAdapter(model_type)
+
+
+def _loaded_values(value: Any) -> Any:
+    # ORM rows -> their loaded column values (the instance __dict__, not a copy), through
+    # dicts and lists. Validating a mapping is several times faster than from_attributes on
+    # instrumented attributes. Rows with expired attributes stay objects (they must reload).
+    state = getattr(value, "_sa_instance_state", None)
+    if state is not None:
+        return value if state.expired_attributes else state.dict
+    if isinstance(value, dict):
+        return {key: _loaded_values(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_loaded_values(item) for item in value]
+    return value
+
+
+def serialize(model_type: Any, value: Any) -> bytes:
+    """JSON bytes of ``value`` as ``model_type``, validated and dumped by a cached TypeAdapter."""
+    adapter = type_adapter(model_type)
+    return adapter.dump_json(adapter.validate_python(_loaded_values(value), from_attributes=True))
+
+
+def respond(
+    model_type: Any,
+    value: Any,
+    *,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Any:
+    """Pre-serialized response for ``value`` if FAST_JSON_RESPONSES is on, else ``value`` itself.
+
+    Endpoints keep their ``response_model`` (OpenAPI and the default path); the fast path
+    returns a ready Response, so FastAPI neither re-validates nor re-encodes it.
+    """
+    if not _settings.FAST_JSON_RESPONSES:
+        return value
+    return Response(serialize(model_type, value), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def respond_json(payload: Any) -> Any:
+    """Like ``respond`` for endpoints returning plain dicts without a response model."""
+    if not _settings.FAST_JSON_RESPONSES:
+        return payload
+    return FastJSONResponse(payload)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from sqlalchemy import Engine, text
+
+# External-content FTS5 index over product names, kept in sync by triggers on products.
+# The content table products_search gives each barcode a stable INTEGER PRIMARY KEY for
+# the FTS rowid: products is keyed by its TEXT barcode, so its implicit rowid may be
+# renumbered by VACUUM and would silently point the index at other products.
+# unicode61 folds case and diacritics; prefix indexes make "nut*" queries index lookups.
+_SQLITE_PRODUCT_FTS = (
+    """
+    CREATE TABLE IF NOT EXISTS products_search (
+        id INTEGER PRIMARY KEY,
+        barcode TEXT NOT NULL UNIQUE,
+        name TEXT
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name,
+        content='products_search',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_search(barcode, name) VALUES (new.barcode, new.name);
+        INSERT INTO products_fts(rowid, name)
+            SELECT id, name FROM products_search WHERE barcode = new.barcode;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name)
+            SELECT 'delete', id, name FROM products_search WHERE barcode = old.barcode;
+        DELETE FROM products_search WHERE barcode = old.barcode;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name)
+            SELECT 'delete', id, name FROM products_search WHERE barcode = old.barcode;
+        UPDATE products_search SET name = new.name WHERE barcode = old.barcode;
+        INSERT INTO products_fts(rowid, name)
+            SELECT id, name FROM products_search WHERE barcode = new.barcode;
+    END
+    """,
+)
+
+# The first layout indexed products.rowid directly; replaced on upgrade
+_DROP_ROWID_INDEX = (
+    "DROP TRIGGER IF EXISTS products_fts_ai",
+    "DROP TRIGGER IF EXISTS products_fts_ad",
+    "DROP TRIGGER IF EXISTS products_fts_au",
+    "DROP TABLE IF EXISTS products_fts",
+)
+
+
+def ensure_product_search_index(engine: Engine) -> None:
+    """Create the SQLite FTS5 product-name index if missing (idempotent).
+
+    Postgres uses a pg_trgm GIN index created by an Alembic migration instead.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_search'")
+        ).first()
+        if exists is None:
+            for statement in _DROP_ROWID_INDEX:
+                conn.execute(text(statement))
+        for statement in _SQLITE_PRODUCT_FTS:
+            conn.execute(text(statement))
+        if exists is None:
+            # Index products stored before the index existed
+            conn.execute(text("INSERT INTO products_search(barcode, name) SELECT barcode, name FROM products"))
+            conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
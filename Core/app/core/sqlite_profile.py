@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+
+def apply_pragmas(
+    engine: Engine,
+    *,
+    busy_timeout_ms: int,
+    cache_size_kib: int,
+    mmap_size: int,
+    read_only: bool = False,
+) -> None:
+    """Tune every new SQLite connection of ``engine`` for concurrent server use."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):  # noqa: ANN001
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL: readers never block the writer and vice versa; NORMAL syncs at
+            # checkpoints instead of every commit (durable against app crashes)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            cursor.execute(f"PRAGMA cache_size=-{int(cache_size_kib)}")
+            cursor.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            if read_only:
+                # A write routed to a reader fails loudly instead of taking the write lock
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+class RoutingSession(Session):
+    """Session sending writes to a single writer engine and plain reads to a reader pool.
+
+    Once a transaction has written, it stays on the writer until it ends, so it
+    reads its own uncommitted changes.
+    """
+
+    def __init__(self, *args: Any, writer: Engine, reader: Engine, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._writer = writer
+        self._reader = reader
+        self._uses_writer = False
+        event.listen(self, "after_transaction_end", self._on_transaction_end)
+
+    def _on_transaction_end(self, session: Session, transaction: Any) -> None:
+        if transaction.parent is None:
+            self._uses_writer = False
+
+    def get_bind(self, mapper: Optional[Any] = None, clause: Optional[Any] = None, **kwargs: Any) -> Engine:
+        if self._uses_writer or self._flushing or isinstance(clause, UpdateBase):
+            self._uses_writer = True
+            return self._writer
+        return self._reader
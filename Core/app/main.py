@@ -1,8 +1,13 @@
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from .core.config import get_settings
 from .api.router import api_router
+from .core.metrics import REGISTRY
+from .core.request_metrics import RequestMetricsMiddleware
 
 # SuperTokens imports (guarded)
 SUPERTOKENS_AVAILABLE = True
@@ -83,6 +88,14 @@ if SUPERTOKENS_AVAILABLE:
 if SUPERTOKENS_AVAILABLE and get_middleware is not None:
     app.add_middleware(get_middleware())  # type: ignore[arg-type]
 
+if settings.SQL_DIAGNOSTICS_ENABLED:
+    from .core.query_diagnostics import QueryDiagnosticsMiddleware
+    app.add_middleware(QueryDiagnosticsMiddleware, repeat_threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+# Outermost middleware, so latency covers CORS/SuperTokens as well
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Mount versioned API
 app.include_router(api_router, prefix="/api/v1")
 
@@ -95,20 +108,44 @@ def root():
         )
     return info
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> PlainTextResponse:
+        # Prometheus text exposition format; numbers are per worker process
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.on_event("startup")
 def on_startup() -> None:
-    # Ensure models are imported so SQLAlchemy is aware of them
-    from .models import user as _user_model  # noqa: F401
-    from .models import food as _food_model  # noqa: F401
-    from .core.database import Base, engine
-
-    # Create tables if they do not exist (initial bootstrap)
-    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    if not settings.RUN_MIGRATIONS_ON_STARTUP:
+        # Schema is managed by the release step (python -m Core.app.commands.migrate)
+        print(f"[startup] In-app migrations disabled; ready in {time.perf_counter() - started:.2f}s")
+        return
 
-    # Run Alembic migrations to keep schema up to date (e.g., add new columns)
+    # Bootstrap tables and run Alembic migrations, one worker at a time
     try:
-        from .migration.migration import migration_service
-        migration_service.run_migrations()
+        from .migration.coordinator import build_coordinator
+        outcome = build_coordinator().run()
     except Exception as e:
         # Log to console; app can still run but schema may be outdated
         print(f"[startup] Migration run failed: {e}")
+        outcome = "migration failed"
+    print(f"[startup] Schema {outcome}; ready in {time.perf_counter() - started:.2f}s")
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    # Close pooled upstream connections, write queued consumptions, close async database
+    # connections, stop the hashing workers
+    from .services.openfoodfacts_client import openfoodfacts_client
+    from .services.consumption_writer import consumption_writer
+    from .core.database import async_engine, async_read_engine
+    from .security.password_hasher import password_hasher
+    await openfoodfacts_client.aclose()
+    if consumption_writer is not None:
+        await consumption_writer.aclose()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    password_hasher.shutdown()
@@ -0,0 +1,132 @@
+import os
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import Engine, text
+
+try:
+  import fcntl
+except ImportError:  # Windows: no flock; local SQLite dev runs a single process anyway
+  fcntl = None  # type: ignore[assignment]
+
+# Fixed key for pg_advisory_lock, shared by every app process and the migrate command
+MIGRATION_LOCK_KEY = zlib.crc32(b"insho:schema-migrations")
+
+
+class MigrationLockTimeout(Exception):
+  """Raised when another process holds the migration lock for too long."""
+
+
+class MigrationCoordinator:
+  """Runs the schema bootstrap and Alembic upgrade in one process at a time.
+
+  The first process takes the lock (Postgres advisory lock, SQLite lock file) and
+  migrates; the others block on the lock and then find the schema already at head,
+  so they skip the work instead of racing the same DDL.
+  """
+
+  def __init__(
+    self,
+    engine: Engine,
+    bootstrap: Callable[[], None],
+    migrate: Callable[[], object],
+    is_up_to_date: Callable[..., bool],
+    lock_timeout: float = 300.0,
+  ):
+    self.engine = engine
+    self.bootstrap = bootstrap
+    self.migrate = migrate
+    self.is_up_to_date = is_up_to_date
+    self.lock_timeout = lock_timeout
+
+  def run(self) -> str:
+    """Migriere, falls nötig; liefert "migrated" oder "up to date" """
+    with self._lock():
+      with self.engine.connect() as connection:
+        if self.is_up_to_date(connection):
+          return "up to date"
+      self.bootstrap()
+      self.migrate()
+      return "migrated"
+
+  @contextmanager
+  def _lock(self) -> Iterator[None]:
+    if self.engine.dialect.name == "postgresql":
+      with self._advisory_lock():
+        yield
+    elif self.engine.dialect.name == "sqlite":
+      with self._file_lock():
+        yield
+    else:
+      yield
+
+  @contextmanager
+  def _advisory_lock(self) -> Iterator[None]:
+    # Session-level lock on a dedicated connection; Alembic migrates on its own connection
+    with self.engine.connect() as connection:
+      deadline = time.monotonic() + self.lock_timeout
+      while not connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar():
+        connection.rollback()
+        if time.monotonic() >= deadline:
+          raise MigrationLockTimeout("another process is still migrating")
+        time.sleep(0.5)
+      try:
+        yield
+      finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+
+  @contextmanager
+  def _file_lock(self) -> Iterator[None]:
+    database = self.engine.url.database
+    if fcntl is None or not database or database == ":memory:":
+      yield
+      return
+    with open(f"{os.path.abspath(database)}.migrate.lock", "a") as handle:
+      deadline = time.monotonic() + self.lock_timeout
+      while True:
+        try:
+          fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+          break
+        except BlockingIOError:
+          if time.monotonic() >= deadline:
+            raise MigrationLockTimeout("another process is still migrating")
+          time.sleep(0.2)
+      try:
+        yield
+      finally:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def bootstrap_schema() -> None:
+  """Erzeuge fehlende Tabellen und Such-Indizes (Initial-Bootstrap)"""
+  # Ensure models are imported so SQLAlchemy is aware of them
+  from ..models import user as _user_model  # noqa: F401
+  from ..models import food as _food_model  # noqa: F401
+  from ..models import product as _product_model  # noqa: F401
+  from ..models import daily_nutrition as _daily_nutrition_model  # noqa: F401
+  from ..core.database import Base, engine
+  from ..core.search_index import ensure_product_search_index
+  from .sqlite_upgrade import upgrade_sqlite_schema
+
+  Base.metadata.create_all(bind=engine)
+  # Columns added since a SQLite database was created (Postgres gets them via migrations)
+  upgrade_sqlite_schema(engine)
+  # SQLite product-name search index (Postgres gets pg_trgm via migrations)
+  ensure_product_search_index(engine)
+
+
+def build_coordinator() -> MigrationCoordinator:
+  from ..core.config import get_settings
+  from ..core.database import engine
+  from .migration import migration_service
+
+  return MigrationCoordinator(
+    engine,
+    bootstrap=bootstrap_schema,
+    migrate=migration_service.run_migrations,
+    is_up_to_date=migration_service.is_up_to_date,
+    lock_timeout=get_settings().MIGRATION_LOCK_TIMEOUT_SECONDS,
+  )
@@ -1,5 +1,6 @@
 from alembic.config import Config
 from alembic import command
+from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
 import os
 from typing import Optional
@@ -22,6 +23,11 @@ class MigrationService:
       print(f"❌ Migration fehlgeschlagen: {e}")
       raise
 
+  def is_up_to_date(self, connection) -> bool:
+    """Prüfe, ob die Datenbank bereits auf dem Head-Stand ist"""
+    current = set(MigrationContext.configure(connection).get_current_heads())
+    return current == set(self.script_dir.get_heads())
+
   def create_migration(self, message: str) -> Optional[str]:
     """Erstelle neue Migration mit Autogenerate"""
     try:
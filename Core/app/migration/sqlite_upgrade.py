@@ -0,0 +1,68 @@
+from typing import Set
+
+from sqlalchemy import Connection, Engine, text
+
+# Columns added to existing tables after their first release. create_all only creates
+# missing tables and the Alembic migrations are Postgres-only, so SQLite databases
+# created by an older version get them here.
+_ADDED_COLUMNS = (
+  ("users", "change_seq", "BIGINT NOT NULL DEFAULT 0"),
+  ("users", "profile_seq", "BIGINT NOT NULL DEFAULT 0"),
+  ("foods", "change_seq", "BIGINT NOT NULL DEFAULT 0"),
+)
+
+# Number existing entries per user in insertion order, then start each user's counter
+# after them (as the Postgres migration 2026_10_18_change_sequences does)
+_BACKFILL_CHANGE_SEQUENCES = (
+  """
+  UPDATE foods
+  SET change_seq = numbered.seq
+  FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY scanned_at, id) AS seq
+    FROM foods
+  ) AS numbered
+  WHERE foods.id = numbered.id AND foods.change_seq = 0
+  """,
+  """
+  UPDATE users
+  SET change_seq = counts.max_seq
+  FROM (SELECT user_id, MAX(change_seq) AS max_seq FROM foods GROUP BY user_id) AS counts
+  WHERE users.id = counts.user_id AND users.change_seq < counts.max_seq
+  """,
+)
+
+_INDEXES = (
+  "CREATE INDEX IF NOT EXISTS ix_foods_user_id_scanned_at ON foods (user_id, scanned_at, id)",
+  "CREATE INDEX IF NOT EXISTS ix_foods_user_id_change_seq ON foods (user_id, change_seq)",
+)
+
+# Rows stored through the old server default (CURRENT_TIMESTAMP) read 'YYYY-MM-DD HH:MM:SS',
+# while SQLAlchemy binds 'YYYY-MM-DD HH:MM:SS.ffffff'. SQLite compares them as strings, so
+# the keyset of /food/history would sort such a row before itself; store them in one format.
+_NORMALIZE_TIMESTAMPS = (
+  "UPDATE foods SET scanned_at = scanned_at || '.000000' WHERE length(scanned_at) = 19",
+)
+
+
+def _columns(conn: Connection, table: str) -> Set[str]:
+  return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def upgrade_sqlite_schema(engine: Engine) -> None:
+  """Bring tables created by an older version up to the current models (idempotent).
+
+  Runs after create_all; a no-op on other dialects and on databases created fresh.
+  """
+  if engine.dialect.name != "sqlite":
+    return
+  with engine.begin() as conn:
+    added = set()
+    for table, column, ddl in _ADDED_COLUMNS:
+      if column not in _columns(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        added.add((table, column))
+    if ("foods", "change_seq") in added:
+      for statement in _BACKFILL_CHANGE_SEQUENCES:
+        conn.execute(text(statement))
+    for statement in _NORMALIZE_TIMESTAMPS + _INDEXES:
+      conn.execute(text(statement))
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import String, Date, DateTime, func, Float, Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+
+
+class DailyNutrition(Base):
+    """Per-user, per-day (UTC) rollup of consumed nutrition, maintained on every consume."""
+
+    __tablename__ = "daily_nutrition"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    grams: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    kcal: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    proteins: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    carbs: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    fats: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, func, Float, ForeignKey
+from sqlalchemy import String, DateTime, func, Float, ForeignKey, Index, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.database import Base
@@ -11,6 +11,13 @@ from ..core.database import Base
 
 class Food(Base):
     __tablename__ = "foods"
+    __table_args__ = (
+        # Serves per-user history pages in (scanned_at, id) order without sorting
+        Index("ix_foods_user_id_scanned_at", "user_id", "scanned_at", "id"),
+        Index("ix_foods_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     barcode: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
@@ -27,5 +34,7 @@ class Food(Base):
     scanned_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Per-user change sequence at insert time (see User.change_seq); drives delta sync
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
 
     # created_at/updated_at intentionally omitted; scanned_at is the authoritative timestamp
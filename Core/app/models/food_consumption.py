@@ -12,6 +12,8 @@ from ..core.database import Base
 class FoodConsumption(Base):
     __tablename__ = "food_consumptions"
 
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
     food_id: Mapped[str] = mapped_column(String(36), ForeignKey("foods.id", ondelete="CASCADE"), index=True, nullable=False)
@@ -1,6 +1,8 @@
 from Core.app.core.database import Base
 from .user import User
+from .product import Product
+from .daily_nutrition import DailyNutrition
 
 # Für Alembic Auto-Detection
 # Zukünftige Models müssen hinzgefügt werden
-__all__ = ["Base", "User"]
+__all__ = ["Base", "User", "Product", "DailyNutrition"]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, func, Float
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+
+
+class Product(Base):
+    """Product catalog: one row per barcode with its nutrition per 100g."""
+
+    __tablename__ = "products"
+
+    barcode: Mapped[str] = mapped_column(String(64), primary_key=True)
+    name: Mapped[str | None] = mapped_column(String(512), nullable=True)
+
+    calories_per_100g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    proteins_per_100g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    carbs_per_100g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fats_per_100g: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Where the nutrition data came from, e.g. "openfoodfacts"
+    source: Mapped[str | None] = mapped_column(String(32), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
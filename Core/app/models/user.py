@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Boolean, DateTime, func, UniqueConstraint, Integer
+from sqlalchemy import String, Boolean, DateTime, func, UniqueConstraint, Integer, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.database import Base
@@ -15,6 +15,8 @@ class User(Base):
         UniqueConstraint("email", name="uq_users_email"),
     )
 
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
@@ -38,3 +40,8 @@ class User(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     is_onboarded: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    # Delta sync: last change sequence issued for this user (bumped per write to the
+    # user's entries or profile) and the sequence of the latest profile change
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    profile_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
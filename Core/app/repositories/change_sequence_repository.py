@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+
+
+def _reserve_statement(user_id: str, count: int):
+    # updated_at is pinned: a sequence bump is not a profile change
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(change_seq=User.change_seq + count, updated_at=User.updated_at)
+        .returning(User.change_seq)
+    )
+
+
+class ChangeSequenceRepository:
+    """Issues the per-user, strictly increasing change sequence used by delta sync.
+
+    ``reserve`` row-locks the user until the caller's transaction ends, so a user's
+    changes commit in sequence order and a reader never sees a gap fill in later
+    below the sequence it has already read.
+    """
+
+    def reserve(self, db: Session, user_id: str, count: int = 1) -> int:
+        """Reserve ``count`` sequence numbers (no commit); returns the highest one."""
+        return db.execute(_reserve_statement(user_id, count)).scalar_one()
+
+
+class AsyncChangeSequenceRepository:
+    """ChangeSequenceRepository for AsyncSession."""
+
+    async def reserve(self, db: AsyncSession, user_id: str, count: int = 1) -> int:
+        return (await db.execute(_reserve_statement(user_id, count))).scalar_one()
@@ -20,7 +20,6 @@ class FoodConsumptionRepository:
         )
         db.add(entry)
         db.commit()
-        db.refresh(entry)
         return entry
 
     def sum_by_user(self, db: Session, *, user_id: str, date_from=None, date_to=None):
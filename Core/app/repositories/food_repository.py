@@ -1,17 +1,130 @@
 from __future__ import annotations
 
-from typing import Optional
+import uuid
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import Row, Select, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models.food import Food
+from .change_sequence_repository import AsyncChangeSequenceRepository, ChangeSequenceRepository
+from .nutrition_rollup_repository import (
+    AsyncNutritionRollupRepository,
+    Bucket,
+    NutritionRollupRepository,
+)
+
+
+def portion(per_100g: float | None, grams: float) -> float:
+    """Nutrient amount in ``grams`` of a food with ``per_100g`` (missing values count as 0)."""
+    return (per_100g or 0.0) * grams / 100.0
+
+
+def _entry_values(
+    *,
+    user_id: str,
+    barcode: str,
+    name: str | None,
+    calories_per_100g: float | None,
+    proteins_per_100g: float | None,
+    carbs_per_100g: float | None,
+    fats_per_100g: float | None,
+    grams: float,
+    scanned_at: datetime,
+    id: Optional[str] = None,
+    change_seq: int = 0,
+) -> Dict[str, Any]:
+    """Column values of a consumption row; id and timestamp are generated client-side."""
+    return {
+        "id": id or str(uuid.uuid4()),
+        "user_id": user_id,
+        "barcode": barcode,
+        "name": name,
+        "calories_per_100g": calories_per_100g,
+        "proteins_per_100g": proteins_per_100g,
+        "carbs_per_100g": carbs_per_100g,
+        "fats_per_100g": fats_per_100g,
+        "grams": grams,
+        "scanned_at": scanned_at,
+        "change_seq": change_seq,
+    }
+
+
+def _rollup_increments(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate consumption rows into one daily rollup increment per (user, UTC day)."""
+    increments: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        grams = row["grams"]
+        day = row["scanned_at"].astimezone(timezone.utc).date()
+        inc = increments.setdefault(
+            (row["user_id"], day),
+            {"user_id": row["user_id"], "day": day, "grams": 0.0, "kcal": 0.0,
+             "proteins": 0.0, "carbs": 0.0, "fats": 0.0, "entries": 0},
+        )
+        inc["grams"] += grams
+        inc["kcal"] += portion(row["calories_per_100g"], grams)
+        inc["proteins"] += portion(row["proteins_per_100g"], grams)
+        inc["carbs"] += portion(row["carbs_per_100g"], grams)
+        inc["fats"] += portion(row["fats_per_100g"], grams)
+        inc["entries"] += 1
+    return list(increments.values())
+
+
+def _new_entry(**fields: Any) -> tuple[Food, Dict[str, Any]]:
+    """Build a consumption row and the matching daily rollup increment."""
+    # Timestamp set here (UTC) so the entry and its daily rollup agree on the day
+    values = _entry_values(**fields, scanned_at=datetime.now(timezone.utc))
+    return Food(**values), _rollup_increments([values])[0]
+
+
+def _change_seq_plan(values: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+    """(user_id, count) reservations for ``values``, in a fixed order so concurrent batches lock users alike."""
+    return sorted(Counter(row["user_id"] for row in values).items())
+
+
+def _assign_change_seqs(values: List[Dict[str, Any]], last_seqs: Dict[str, int], counts: Dict[str, int]) -> None:
+    # Number each user's rows consecutively, ending at the reserved maximum
+    next_seq = {user_id: last_seqs[user_id] - counts[user_id] + 1 for user_id in last_seqs}
+    for row in values:
+        row["change_seq"] = next_seq[row["user_id"]]
+        next_seq[row["user_id"]] += 1
+
+
+def _within_days(stmt: Select, date_from: Optional[date], date_to: Optional[date]) -> Select:
+    # Half-open UTC day bounds on the raw column keep the composite index usable
+    if date_from is not None:
+        stmt = stmt.where(Food.scanned_at >= datetime.combine(date_from, time.min, tzinfo=timezone.utc))
+    if date_to is not None:
+        stmt = stmt.where(Food.scanned_at < datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc))
+    return stmt
+
+
+# Columns of an export row, in output order
+_EXPORT_COLUMNS = (
+    Food.id,
+    Food.scanned_at,
+    Food.barcode,
+    Food.name,
+    Food.grams,
+    Food.calories_per_100g,
+    Food.proteins_per_100g,
+    Food.carbs_per_100g,
+    Food.fats_per_100g,
+)
+EXPORT_FIELDS = tuple(column.key for column in _EXPORT_COLUMNS)
 
 
 class FoodRepository:
-    def get_latest_by_barcode(self, db: Session, barcode: str) -> Optional[Food]:
-        stmt = select(Food).where(Food.barcode == barcode).order_by(Food.scanned_at.desc())
-        return db.execute(stmt).scalars().first()
+    def __init__(
+        self,
+        rollups: Optional[NutritionRollupRepository] = None,
+        seqs: Optional[ChangeSequenceRepository] = None,
+    ) -> None:
+        self.rollups = rollups if rollups is not None else NutritionRollupRepository()
+        self.seqs = seqs if seqs is not None else ChangeSequenceRepository()
 
     def create_entry(
         self,
@@ -26,7 +139,7 @@ class FoodRepository:
         fats_per_100g: float | None,
         grams: float,
     ) -> Food:
-        food = Food(
+        food, rollup = _new_entry(
             user_id=user_id,
             barcode=barcode,
             name=name,
@@ -36,18 +149,170 @@ class FoodRepository:
             fats_per_100g=fats_per_100g,
             grams=grams,
         )
+        food.change_seq = self.seqs.reserve(db, user_id)
         db.add(food)
+        # Same transaction as the insert: the rollup never drifts from the raw rows
+        self.rollups.add(db, **rollup)
         db.commit()
-        db.refresh(food)
         return food
 
-    def totals_by_user(self, db: Session, *, user_id: str):
-        stmt = select(
-            func.sum(Food.grams).label("grams"),
-            func.sum((Food.calories_per_100g or 0) * (Food.grams / 100.0)).label("calories")  # type: ignore
-        ).where(Food.user_id == user_id)
-        row = db.execute(stmt).one()
-        return {
-            "grams": float(row.grams or 0),
-            "calories": float(row.calories or 0),
-        }
+    def totals_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        # Reads O(days) rollup rows instead of summing the full consumption history
+        return self.rollups.totals(db, user_id=user_id, date_from=date_from, date_to=date_to)
+
+    def series_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        bucket: Bucket,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        return self.rollups.series(db, user_id=user_id, bucket=bucket, date_from=date_from, date_to=date_to)
+
+    def history_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Tuple[List[Food], Optional[Tuple[datetime, str]]]:
+        """One page of the user's entries, newest first, and the keyset of the next page (or None).
+
+        Keyset pagination: the page starts right after ``after`` = (scanned_at, id) of the previous
+        page's last row, so every page is an index range scan regardless of its depth.
+        """
+        stmt = _within_days(select(Food).where(Food.user_id == user_id), date_from, date_to)
+        if after is not None:
+            stmt = stmt.where(tuple_(Food.scanned_at, Food.id) < tuple_(*after))
+        stmt = stmt.order_by(Food.scanned_at.desc(), Food.id.desc()).limit(limit + 1)
+
+        items = list(db.scalars(stmt))
+        if len(items) <= limit:
+            return items, None
+        last = items[limit - 1]
+        return items[:limit], (last.scanned_at, last.id)
+
+    def iter_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """All of the user's entries, oldest first, as column rows streamed in batches.
+
+        ``yield_per`` fetches ``batch_size`` rows at a time (a server-side cursor on
+        Postgres), so memory does not grow with the history.
+        """
+        stmt = _within_days(select(*_EXPORT_COLUMNS).where(Food.user_id == user_id), date_from, date_to)
+        stmt = stmt.order_by(Food.scanned_at, Food.id).execution_options(yield_per=batch_size)
+        yield from db.execute(stmt)
+
+
+class AsyncFoodRepository:
+    """FoodRepository write path for AsyncSession."""
+
+    def __init__(
+        self,
+        rollups: Optional[AsyncNutritionRollupRepository] = None,
+        seqs: Optional[AsyncChangeSequenceRepository] = None,
+    ) -> None:
+        self.rollups = rollups if rollups is not None else AsyncNutritionRollupRepository()
+        self.seqs = seqs if seqs is not None else AsyncChangeSequenceRepository()
+
+    async def create_entry(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        barcode: str,
+        name: str | None,
+        calories_per_100g: float | None,
+        proteins_per_100g: float | None,
+        carbs_per_100g: float | None,
+        fats_per_100g: float | None,
+        grams: float,
+    ) -> Food:
+        food, rollup = _new_entry(
+            user_id=user_id,
+            barcode=barcode,
+            name=name,
+            calories_per_100g=calories_per_100g,
+            proteins_per_100g=proteins_per_100g,
+            carbs_per_100g=carbs_per_100g,
+            fats_per_100g=fats_per_100g,
+            grams=grams,
+        )
+        food.change_seq = await self.seqs.reserve(db, user_id)
+        db.add(food)
+        await self.rollups.add(db, **rollup)
+        await db.commit()
+        return food
+
+    async def create_entries(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Food]:
+        """Insert many consumption rows with one bulk INSERT and one commit.
+
+        ``rows`` are keyword sets as accepted by ``create_entry``, optionally with a
+        client-chosen ``id`` and ``scanned_at`` (offline uploads).
+        """
+        scanned_at = datetime.now(timezone.utc)
+        values = [_entry_values(**{"scanned_at": scanned_at, **row}) for row in rows]
+        plan = _change_seq_plan(values)
+        last_seqs = {user_id: await self.seqs.reserve(db, user_id, count) for user_id, count in plan}
+        _assign_change_seqs(values, last_seqs, dict(plan))
+        # executemany / multi-row VALUES; no per-row flush or refresh round-trips
+        await db.execute(insert(Food), values)
+        for increment in _rollup_increments(values):
+            await self.rollups.add(db, **increment)
+        await db.commit()
+        return [Food(**row) for row in values]
+
+    async def existing_owners(self, db: AsyncSession, ids: Iterable[str]) -> Dict[str, str]:
+        """Map the already stored ones among ``ids`` to their owning user id."""
+        wanted = list(set(ids))
+        if not wanted:
+            return {}
+        result = await db.execute(select(Food.id, Food.user_id).where(Food.id.in_(wanted)))
+        return {row.id: row.user_id for row in result}
+
+    async def recent(self, db: AsyncSession, *, user_id: str, limit: int) -> List[Food]:
+        """The user's ``limit`` newest entries (a short scan of the history index)."""
+        stmt = (
+            select(Food)
+            .where(Food.user_id == user_id)
+            .order_by(Food.scanned_at.desc(), Food.id.desc())
+            .limit(limit)
+        )
+        return list((await db.execute(stmt)).scalars())
+
+    async def changes_since(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        after: int,
+        upto: int,
+        limit: int,
+    ) -> List[Food]:
+        """Entries with ``after < change_seq <= upto`` in sequence order (index range scan)."""
+        stmt = (
+            select(Food)
+            .where(Food.user_id == user_id, Food.change_seq > after, Food.change_seq <= upto)
+            .order_by(Food.change_seq)
+            .limit(limit)
+        )
+        return list((await db.execute(stmt)).scalars())
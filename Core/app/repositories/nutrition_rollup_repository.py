@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional
+
+from sqlalchemy import select, delete, insert, func, cast, Date, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert_insert
+from ..models.daily_nutrition import DailyNutrition
+from ..models.food import Food
+
+# Rollup columns in the order used by add() and rebuild()
+_NUTRIENTS = ("grams", "kcal", "proteins", "carbs", "fats")
+
+
+def utc_day(column, dialect_name: str):
+    """SQL expression for the UTC calendar day of a timestamp column."""
+    if dialect_name == "postgresql":
+        return func.date(func.timezone("UTC", column))
+    # SQLite stores CURRENT_TIMESTAMP / naive UTC datetimes as text
+    return func.date(column)
+
+
+Bucket = Literal["day", "week", "month"]
+
+
+def bucket_start(column, bucket: Bucket, dialect_name: str):
+    """SQL expression mapping a DATE column to the first day of its bucket (ISO weeks start Monday)."""
+    if bucket == "day":
+        return column
+    if dialect_name == "postgresql":
+        # Inline the unit so SELECT and GROUP BY render the identical expression
+        return cast(func.date_trunc(literal_column(f"'{bucket}'"), column), Date)
+    if bucket == "week":
+        # Back up 6 days, then forward to the next Monday: the Monday on or before ``column``
+        return func.date(column, literal_column("'-6 days'"), literal_column("'weekday 1'"))
+    return func.strftime("%Y-%m-01", column)
+
+
+def _increment_statement(dialect_name: str, user_id: str, day: date, values: Dict[str, Any]):
+    """Upsert adding ``values`` onto the (user_id, day) row, or None if the dialect lacks ON CONFLICT."""
+    insert_ = upsert_insert(dialect_name)
+    if insert_ is None:
+        return None
+    stmt = insert_(DailyNutrition).values(user_id=user_id, day=day, **values)
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyNutrition.user_id, DailyNutrition.day],
+        set_={
+            **{key: getattr(DailyNutrition, key) + stmt.excluded[key] for key in values},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _apply_increment(row: Optional[DailyNutrition], user_id: str, day: date, values: Dict[str, Any]):
+    """Fallback for dialects without ON CONFLICT: returns a new row to add, or None if updated in place."""
+    if row is None:
+        return DailyNutrition(user_id=user_id, day=day, **values)
+    for key, value in values.items():
+        setattr(row, key, getattr(row, key) + value)
+    return None
+
+
+class NutritionRollupRepository:
+    def add(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        day: date,
+        grams: float,
+        kcal: float,
+        proteins: float,
+        carbs: float,
+        fats: float,
+        entries: int = 1,
+    ) -> None:
+        """Add to the user's rollup row for ``day`` inside the caller's transaction (no commit)."""
+        values: Dict[str, Any] = {
+            "grams": grams,
+            "kcal": kcal,
+            "proteins": proteins,
+            "carbs": carbs,
+            "fats": fats,
+            "entries": entries,
+        }
+        stmt = _increment_statement(db.get_bind().dialect.name, user_id, day, values)
+        if stmt is not None:
+            db.execute(stmt)
+            return
+        new_row = _apply_increment(db.get(DailyNutrition, (user_id, day), with_for_update=True), user_id, day, values)
+        if new_row is not None:
+            db.add(new_row)
+        db.flush()
+
+    def totals(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Dict[str, float]:
+        stmt = select(
+            func.sum(DailyNutrition.grams).label("grams"),
+            func.sum(DailyNutrition.kcal).label("calories"),
+            func.sum(DailyNutrition.proteins).label("proteins"),
+            func.sum(DailyNutrition.carbs).label("carbs"),
+            func.sum(DailyNutrition.fats).label("fats"),
+        ).where(DailyNutrition.user_id == user_id)
+        if date_from is not None:
+            stmt = stmt.where(DailyNutrition.day >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(DailyNutrition.day <= date_to)
+        row = db.execute(stmt).one()
+        return {
+            "grams": float(row.grams or 0),
+            "calories": float(row.calories or 0),
+            "proteins": float(row.proteins or 0),
+            "carbs": float(row.carbs or 0),
+            "fats": float(row.fats or 0),
+        }
+
+    def series(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        bucket: Bucket,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Nutrition totals grouped into day/week/month buckets, computed in one grouped query."""
+        period = bucket_start(DailyNutrition.day, bucket, db.get_bind().dialect.name).label("period_start")
+        stmt = (
+            select(
+                period,
+                func.sum(DailyNutrition.grams).label("grams"),
+                func.sum(DailyNutrition.kcal).label("calories"),
+                func.sum(DailyNutrition.proteins).label("proteins"),
+                func.sum(DailyNutrition.carbs).label("carbs"),
+                func.sum(DailyNutrition.fats).label("fats"),
+                func.sum(DailyNutrition.entries).label("entries"),
+            )
+            .where(DailyNutrition.user_id == user_id)
+            .group_by(period)
+            .order_by(period)
+        )
+        if date_from is not None:
+            stmt = stmt.where(DailyNutrition.day >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(DailyNutrition.day <= date_to)
+        return [
+            {
+                "period_start": row.period_start,
+                "grams": float(row.grams or 0),
+                "calories": float(row.calories or 0),
+                "proteins": float(row.proteins or 0),
+                "carbs": float(row.carbs or 0),
+                "fats": float(row.fats or 0),
+                "entries": int(row.entries or 0),
+            }
+            for row in db.execute(stmt)
+        ]
+
+    def rebuild(self, db: Session, *, user_id: Optional[str] = None) -> int:
+        """Recompute rollups from the raw consumption rows in one transaction.
+
+        Returns the number of rollup rows written.
+        """
+        day = utc_day(Food.scanned_at, db.get_bind().dialect.name)
+        per_100g = Food.grams / 100.0
+        source = select(
+            Food.user_id,
+            day.label("day"),
+            func.coalesce(func.sum(Food.grams), 0.0),
+            func.coalesce(func.sum(func.coalesce(Food.calories_per_100g, 0.0) * per_100g), 0.0),
+            func.coalesce(func.sum(func.coalesce(Food.proteins_per_100g, 0.0) * per_100g), 0.0),
+            func.coalesce(func.sum(func.coalesce(Food.carbs_per_100g, 0.0) * per_100g), 0.0),
+            func.coalesce(func.sum(func.coalesce(Food.fats_per_100g, 0.0) * per_100g), 0.0),
+            func.count(Food.id),
+        ).group_by(Food.user_id, day)
+
+        clear = delete(DailyNutrition)
+        if user_id is not None:
+            source = source.where(Food.user_id == user_id)
+            clear = clear.where(DailyNutrition.user_id == user_id)
+
+        db.execute(clear)
+        result = db.execute(
+            insert(DailyNutrition).from_select(
+                ["user_id", "day", *_NUTRIENTS, "entries"], source
+            )
+        )
+        db.commit()
+        return result.rowcount or 0
+
+
+class AsyncNutritionRollupRepository:
+    """NutritionRollupRepository for AsyncSession (write path and single-day reads)."""
+
+    async def get_day(self, db: AsyncSession, *, user_id: str, day: date) -> Optional[DailyNutrition]:
+        """The user's rollup row for ``day`` (primary-key lookup), or None if nothing was consumed."""
+        return await db.get(DailyNutrition, (user_id, day))
+
+    async def add(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        day: date,
+        grams: float,
+        kcal: float,
+        proteins: float,
+        carbs: float,
+        fats: float,
+        entries: int = 1,
+    ) -> None:
+        """Add to the user's rollup row for ``day`` inside the caller's transaction (no commit)."""
+        values: Dict[str, Any] = {
+            "grams": grams,
+            "kcal": kcal,
+            "proteins": proteins,
+            "carbs": carbs,
+            "fats": fats,
+            "entries": entries,
+        }
+        stmt = _increment_statement(db.get_bind().dialect.name, user_id, day, values)
+        if stmt is not None:
+            await db.execute(stmt)
+            return
+        row = await db.get(DailyNutrition, (user_id, day), with_for_update=True)
+        new_row = _apply_increment(row, user_id, day, values)
+        if new_row is not None:
+            db.add(new_row)
+        await db.flush()
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert_insert
+from ..models.product import Product
+
+
+def _upsert_statement(dialect_name: str, values: Dict[str, Any] | List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT (barcode) DO UPDATE, or None if the dialect lacks it.
+
+    ``values`` may be a list of rows (same keys) for a single multi-row INSERT.
+    """
+    insert = upsert_insert(dialect_name)
+    if insert is None:
+        return None
+    rows = values if isinstance(values, list) else [values]
+    stmt = insert(Product).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Product.barcode],
+        set_={
+            **{key: stmt.excluded[key] for key in rows[0] if key != "barcode"},
+            "updated_at": func.now(),
+        },
+    )
+
+
+# Upsert RETURNING overwrites products the session already holds
+_REFRESH = {"populate_existing": True}
+
+# Columns written by bulk imports, in COPY order
+_IMPORT_COLUMNS = (
+    "barcode",
+    "name",
+    "calories_per_100g",
+    "proteins_per_100g",
+    "carbs_per_100g",
+    "fats_per_100g",
+    "source",
+)
+
+
+def _search_statement(dialect_name: str, query: str, limit: int):
+    """Ranked product-name search backed by the dialect's text index, or None if ``query`` has no terms."""
+    if dialect_name == "sqlite":
+        # FTS5: every term must match as a word prefix; rank by bm25, then shorter names
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return None
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            select(Product)
+            .from_statement(
+                text(
+                    "SELECT products.* FROM products_fts "
+                    "JOIN products_search ON products_search.id = products_fts.rowid "
+                    "JOIN products ON products.barcode = products_search.barcode "
+                    "WHERE products_fts MATCH :match "
+                    "ORDER BY bm25(products_fts), length(products.name) LIMIT :limit"
+                )
+            )
+            .params(match=match, limit=limit)
+        )
+
+    term = query.strip().lower()
+    if not term:
+        return None
+    name = func.lower(Product.name)
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    prefix = name.like(escaped + "%", escape="\\")
+    stmt = select(Product)
+    if dialect_name == "postgresql":
+        # pg_trgm GIN on lower(name): prefix LIKE and fuzzy word similarity (<%) are both index scans
+        fuzzy = literal(term).op("<%", is_comparison=True)(name)
+        stmt = stmt.where(or_(prefix, fuzzy)).order_by(
+            prefix.desc(), func.word_similarity(term, name).desc(), func.length(Product.name)
+        )
+    else:
+        stmt = stmt.where(prefix).order_by(func.length(Product.name))
+    return stmt.limit(limit)
+
+
+class ProductRepository:
+    def get(self, db: Session, barcode: str) -> Optional[Product]:
+        # Primary-key lookup; served from the identity map when already loaded
+        return db.get(Product, barcode)
+
+    def upsert(
+        self,
+        db: Session,
+        *,
+        barcode: str,
+        name: str | None,
+        calories_per_100g: float | None,
+        proteins_per_100g: float | None,
+        carbs_per_100g: float | None,
+        fats_per_100g: float | None,
+        source: str | None,
+    ) -> Product:
+        values = {
+            "barcode": barcode,
+            "name": name,
+            "calories_per_100g": calories_per_100g,
+            "proteins_per_100g": proteins_per_100g,
+            "carbs_per_100g": carbs_per_100g,
+            "fats_per_100g": fats_per_100g,
+            "source": source,
+        }
+        dialect = db.get_bind().dialect
+        stmt = _upsert_statement(dialect.name, values)
+        if stmt is not None and dialect.insert_returning:
+            # The stored row (incl. updated_at) comes back from the upsert itself
+            product = db.scalars(stmt.returning(Product), execution_options=_REFRESH).one()
+            db.commit()
+            return product
+        if stmt is not None:
+            db.execute(stmt)
+        else:
+            db.merge(Product(**values))
+        db.commit()
+        product = db.get(Product, barcode, populate_existing=True)
+        assert product is not None
+        return product
+
+    def bulk_upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Upsert a chunk of products (keys as in ``upsert``, unique barcodes) and commit.
+
+        Postgres streams the chunk with COPY into a temp table and merges it with one
+        INSERT ... SELECT ... ON CONFLICT; other dialects use a single executemany.
+        """
+        if not rows:
+            return 0
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            self._copy_upsert(db, rows)
+        else:
+            insert = upsert_insert(dialect_name)
+            if insert is None:
+                for values in rows:
+                    db.merge(Product(**values))
+            else:
+                stmt = insert(Product)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Product.barcode],
+                    set_={
+                        **{key: stmt.excluded[key] for key in _IMPORT_COLUMNS if key != "barcode"},
+                        "updated_at": func.now(),
+                    },
+                )
+                db.execute(stmt, rows)
+        db.commit()
+        return len(rows)
+
+    def _copy_upsert(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        columns = ", ".join(_IMPORT_COLUMNS)
+        db.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS products_import "
+                "(LIKE products INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        # psycopg 3 COPY on the session's own connection and transaction
+        dbapi_connection = db.connection().connection.driver_connection
+        with dbapi_connection.cursor() as cursor:
+            with cursor.copy(f"COPY products_import ({columns}) FROM STDIN") as copy:
+                for values in rows:
+                    copy.write_row(tuple(values[key] for key in _IMPORT_COLUMNS))
+        updates = ", ".join(f"{key} = EXCLUDED.{key}" for key in _IMPORT_COLUMNS if key != "barcode")
+        db.execute(
+            text(
+                f"INSERT INTO products ({columns}) SELECT {columns} FROM products_import "
+                f"ON CONFLICT (barcode) DO UPDATE SET {updates}, updated_at = now()"
+            )
+        )
+
+
+class AsyncProductRepository:
+    """ProductRepository for AsyncSession."""
+
+    async def get(self, db: AsyncSession, barcode: str) -> Optional[Product]:
+        return await db.get(Product, barcode)
+
+    async def upsert(
+        self,
+        db: AsyncSession,
+        *,
+        barcode: str,
+        name: str | None,
+        calories_per_100g: float | None,
+        proteins_per_100g: float | None,
+        carbs_per_100g: float | None,
+        fats_per_100g: float | None,
+        source: str | None,
+    ) -> Product:
+        values = {
+            "barcode": barcode,
+            "name": name,
+            "calories_per_100g": calories_per_100g,
+            "proteins_per_100g": proteins_per_100g,
+            "carbs_per_100g": carbs_per_100g,
+            "fats_per_100g": fats_per_100g,
+            "source": source,
+        }
+        dialect = db.get_bind().dialect
+        stmt = _upsert_statement(dialect.name, values)
+        if stmt is not None and dialect.insert_returning:
+            product = (await db.scalars(stmt.returning(Product), execution_options=_REFRESH)).one()
+            await db.commit()
+            return product
+        if stmt is not None:
+            await db.execute(stmt)
+        else:
+            await db.merge(Product(**values))
+        await db.commit()
+        product = await db.get(Product, barcode, populate_existing=True)
+        assert product is not None
+        return product
+
+    async def search(self, db: AsyncSession, query: str, *, limit: int = 20) -> List[Product]:
+        stmt = _search_statement(db.get_bind().dialect.name, query, limit)
+        if stmt is None:
+            return []
+        return list((await db.execute(stmt)).scalars())
+
+    async def get_many(self, db: AsyncSession, barcodes: Iterable[str]) -> List[Product]:
+        """Load all known products among ``barcodes`` with one IN query."""
+        wanted = list(set(barcodes))
+        if not wanted:
+            return []
+        result = await db.execute(select(Product).where(Product.barcode.in_(wanted)))
+        return list(result.scalars())
+
+    async def upsert_many(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Product]:
+        """Upsert ``rows`` (keys as in ``upsert``) in one statement and one commit."""
+        if not rows:
+            return []
+        dialect = db.get_bind().dialect
+        stmt = _upsert_statement(dialect.name, rows)
+        if stmt is not None and dialect.insert_returning:
+            products = list(await db.scalars(stmt.returning(Product), execution_options=_REFRESH))
+            await db.commit()
+            return products
+        if stmt is not None:
+            await db.execute(stmt)
+        else:
+            for values in rows:
+                await db.merge(Product(**values))
+        await db.commit()
+        result = await db.execute(
+            select(Product)
+            .where(Product.barcode.in_([values["barcode"] for values in rows]))
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars())
@@ -3,14 +3,40 @@ from __future__ import annotations
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from ..models.user import User
+from ..security.principal import invalidate_principal
+from .change_sequence_repository import AsyncChangeSequenceRepository, ChangeSequenceRepository
+
+
+# Profile fields that onboarding / PATCH /users/me may change
+_ONBOARDING_FIELDS = (
+    "name",
+    "age",
+    "height",
+    "weight",
+    "gender",
+    "activity_level",
+    "kcal_goal",
+    "is_onboarded",
+)
+
+
+def _apply_onboarding(user: User, fields: dict) -> None:
+    # Update only provided, non-None values
+    for key in _ONBOARDING_FIELDS:
+        if key in fields and fields[key] is not None:
+            setattr(user, key, fields[key])
 
 
 class UserRepository:
+    def __init__(self, seqs: Optional[ChangeSequenceRepository] = None) -> None:
+        self.seqs = seqs if seqs is not None else ChangeSequenceRepository()
+
     def get_by_id(self, db: Session, user_id: str) -> Optional[User]:
         return db.get(User, user_id)
 
@@ -34,32 +60,74 @@ class UserRepository:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        db.refresh(user)
         return user
 
     def set_onboarded(self, db: Session, user: User, is_onboarded: bool) -> User:
         user.is_onboarded = is_onboarded
+        user.profile_seq = self.seqs.reserve(db, user.id)
+        db.add(user)
+        db.commit()
+        invalidate_principal(user.id)
+        return user
+
+    def set_active(self, db: Session, user: User, is_active: bool) -> User:
+        user.is_active = is_active
+        user.profile_seq = self.seqs.reserve(db, user.id)
         db.add(user)
         db.commit()
-        db.refresh(user)
+        # Deactivation must take effect on the next request, not after the cache TTL
+        invalidate_principal(user.id)
         return user
 
     def update_onboarding(self, db: Session, user: User, **fields) -> User:
-        # Update only provided, non-None values
-        updatable = [
-            "name",
-            "age",
-            "height",
-            "weight",
-            "gender",
-            "activity_level",
-            "kcal_goal",
-            "is_onboarded",
-        ]
-        for key in updatable:
-            if key in fields and fields[key] is not None:
-                setattr(user, key, fields[key])
+        _apply_onboarding(user, fields)
+        user.profile_seq = self.seqs.reserve(db, user.id)
         db.add(user)
         db.commit()
-        db.refresh(user)
+        invalidate_principal(user.id)
+        return user
+
+
+class AsyncUserRepository:
+    """UserRepository for AsyncSession."""
+
+    def __init__(self, seqs: Optional[AsyncChangeSequenceRepository] = None) -> None:
+        self.seqs = seqs if seqs is not None else AsyncChangeSequenceRepository()
+
+    async def get_by_id(self, db: AsyncSession, user_id: str, *, fresh: bool = False) -> Optional[User]:
+        # fresh: re-read the row even if the session already holds it (expire_on_commit is off)
+        return await db.get(User, user_id, populate_existing=fresh)
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        normalized = email.strip().lower()
+        stmt = select(User).where(User.email == normalized)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    async def create(self, db: AsyncSession, *, email: str, hashed_password: str, name: str | None) -> User:
+        normalized = email.strip().lower()
+        user = User(email=normalized, hashed_password=hashed_password, name=name)
+        db.add(user)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+        return user
+
+    async def update_password_hash(self, db: AsyncSession, user: User, hashed_password: str) -> User:
+        # Not part of the cached principal, so no invalidation needed
+        user.hashed_password = hashed_password
+        db.add(user)
+        await db.commit()
+        return user
+
+    async def update_onboarding(self, db: AsyncSession, user: User, **fields) -> User:
+        _apply_onboarding(user, fields)
+        user.profile_seq = await self.seqs.reserve(db, user.id)
+        db.add(user)
+        await db.commit()
+        invalidate_principal(user.id)
         return user
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class DashboardRecentItem(BaseModel):
+    id: str
+    barcode: str
+    name: Optional[str] = None
+    grams: float
+    calories: float
+    scanned_at: datetime
+
+
+class DashboardIntake(BaseModel):
+    grams: float
+    calories: float
+    proteins: float
+    carbs: float
+    fats: float
+    entries: int
+
+
+class DashboardResponse(BaseModel):
+    show_onboarding: bool
+    day: date  # UTC day the intake refers to
+    kcal_goal: Optional[int] = None
+    # kcal_goal - consumed calories; None without a goal
+    kcal_remaining: Optional[float] = None
+    today: DashboardIntake
+    recent: list[DashboardRecentItem]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -25,19 +25,59 @@ class FoodRead(FoodBase):
         from_attributes = True
 
 
+class ProductRead(BaseModel):
+    # Catalog rows as stored: imported dumps carry codes shorter than FoodBase accepts
+    barcode: str
+    name: Optional[str] = None
+    calories_per_100g: Optional[float] = None
+    proteins_per_100g: Optional[float] = None
+    carbs_per_100g: Optional[float] = None
+    fats_per_100g: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
 class FoodLookupRequest(BaseModel):
     barcode: str
 
 
 class FoodLookupResponse(BaseModel):
-    food: FoodBase | None
+    food: ProductRead | None
     source: str  # "db" | "openfoodfacts" | "not_found"
 
 
+class FoodSearchResponse(BaseModel):
+    items: list[ProductRead]
+
+
 class FoodConsumeRequest(BaseModel):
     barcode: str
     grams: float = Field(gt=0)
 
 
+class FoodConsumeBatchRequest(BaseModel):
+    items: list[FoodConsumeRequest] = Field(min_length=1, max_length=500)
+
+
 class FoodListResponse(BaseModel):
     items: list[FoodRead]
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class NutritionBucket(BaseModel):
+    period_start: date
+    grams: float
+    calories: float
+    proteins: float
+    carbs: float
+    fats: float
+    entries: int
+
+
+class NutritionSeriesResponse(BaseModel):
+    bucket: Literal["day", "week", "month"]
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    items: list[NutritionBucket]
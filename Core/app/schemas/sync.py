@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .food import FoodRead
+from .user import UserRead
+
+
+class SyncEntryUpload(BaseModel):
+    # Client-generated UUID; re-uploading the same id is a no-op
+    id: str = Field(min_length=36, max_length=36)
+    barcode: str = Field(min_length=4, max_length=64)
+    grams: float = Field(gt=0)
+    scanned_at: datetime
+
+
+class SyncRequest(BaseModel):
+    # Cursor from the previous sync response; omit for a full initial sync
+    cursor: Optional[int] = Field(default=None, ge=0)
+    entries: list[SyncEntryUpload] = Field(default_factory=list, max_length=500)
+    limit: int = Field(default=500, ge=1, le=1000)
+
+
+class SyncRejectedEntry(BaseModel):
+    id: str
+    reason: str  # "unknown_barcode" | "id_conflict"
+
+
+class SyncResponse(BaseModel):
+    cursor: int
+    # True when more changes are pending; call again with ``cursor``
+    has_more: bool
+    profile: Optional[UserRead] = None
+    entries: list[FoodRead]
+    accepted: list[str]
+    rejected: list[SyncRejectedEntry]
@@ -6,18 +6,20 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import get_settings
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..models.user import User
-
-# Use a pure-Python hashing scheme by default to avoid optional bcrypt dependency issues in dev
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+from .password_hasher import build_context
+from .principal import Principal, principal_cache
 
 _settings = get_settings()
 
+# Use a pure-Python hashing scheme by default to avoid optional bcrypt dependency issues in dev.
+# Request handlers hash through security.password_hasher, which runs off the event loop.
+pwd_context = build_context(_settings.PASSWORD_HASH_ROUNDS)
+
 # Expose an OAuth2 scheme for OpenAPI; tokenUrl points to our login endpoint
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -44,8 +46,8 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -61,7 +63,14 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.get(User, user_id)
+    # Hot path: a cached principal needs no database access
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = await db.get(User, user_id)
     if user is None or not user.is_active:
         raise credentials_exception
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal)
+    return principal
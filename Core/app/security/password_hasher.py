@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..core.config import get_settings
+
+
+class HashingOverloaded(Exception):
+    """Raised when too many hash/verify jobs are already queued."""
+
+
+@lru_cache
+def build_context(rounds: int) -> CryptContext:
+    # Pin min/max to the configured cost so hashes with any other cost are
+    # reported by verify_and_update() and transparently rehashed on login.
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+# Module-level job functions so they can be shipped to a process pool
+def _hash_job(rounds: int, password: str) -> str:
+    return build_context(rounds).hash(password)
+
+
+def _verify_and_update_job(rounds: int, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return build_context(rounds).verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """Runs CPU-bound password hashing on a dedicated, size-limited executor.
+
+    At most ``max_pending`` jobs may be queued or running; further calls fail
+    fast with HashingOverloaded instead of piling up, so a login storm cannot
+    starve the event loop or the request threadpool.
+    """
+
+    def __init__(self, *, rounds: int, workers: int, max_pending: int, kind: str = "thread") -> None:
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingOverloaded("password hashing queue is full")
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, self.rounds, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash_job, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Return (valid, new_hash); new_hash is set when the stored hash uses a different cost."""
+        return await self._submit(_verify_and_update_job, password, hashed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_settings = get_settings()
+
+password_hasher = PasswordHasher(
+    rounds=_settings.PASSWORD_HASH_ROUNDS,
+    workers=_settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    max_pending=_settings.PASSWORD_HASH_MAX_PENDING,
+    kind=_settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import cached_property
+
+from ..core.cache import TTLCache
+from ..core.conditional import make_etag
+from ..core.config import get_settings
+from ..models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of an authenticated user, cached between requests.
+
+    Carries the profile fields exposed by ``UserRead`` but never the password hash.
+    Load the ``User`` row explicitly when it needs to be modified.
+    """
+
+    id: str
+    email: str
+    name: str | None
+    gender: str | None
+    activity_level: str | None
+    age: int | None
+    height: int | None
+    weight: int | None
+    kcal_goal: int | None
+    is_active: bool
+    is_onboarded: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+    @cached_property
+    def etag(self) -> str:
+        """ETag of the ``UserRead`` representation; computed once per cached snapshot.
+
+        Covers every exposed field, not only ``updated_at``, whose resolution is one
+        second on SQLite.
+        """
+        return make_etag(*(getattr(self, f.name) for f in fields(self)))
+
+
+_settings = get_settings()
+
+# Verified principals by user id; entries are dropped whenever the user row changes
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=_settings.PRINCIPAL_CACHE_MAXSIZE, ttl=_settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.pop(user_id)
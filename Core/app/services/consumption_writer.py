@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.database import AsyncSessionLocal
+from ..core.metrics import histogram
+from ..models.food import Food
+from ..repositories.food_repository import AsyncFoodRepository
+
+BATCH_ROWS = histogram(
+    "insho_consume_batch_rows",
+    "Consumption rows written per group commit.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+_Pending = Tuple[Dict[str, Any], "asyncio.Future[Food]"]
+
+
+class ConsumptionWriter:
+    """Group commit for consumption inserts.
+
+    ``submit`` queues a row and waits; the queue is written as one multi-row INSERT
+    and one commit (``AsyncFoodRepository.create_entries``) once ``max_delay``
+    seconds have passed since its first row or it holds ``max_batch`` rows.
+    The caller is resumed only after that commit, so an acknowledged entry is as
+    durable as with a per-request commit.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch: int,
+        max_delay: float,
+        repo: Optional[AsyncFoodRepository] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch must be > 0")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.repo = repo if repo is not None else AsyncFoodRepository()
+        self._session_factory = session_factory
+        self._pending: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set["asyncio.Task[None]"] = set()
+
+    async def submit(self, row: Dict[str, Any]) -> Food:
+        """Queue one row (``create_entry`` keywords) and return it once committed."""
+        loop = asyncio.get_running_loop()
+        # Timestamp of the request, not of the flush
+        row = {"scanned_at": datetime.now(timezone.utc), **row}
+        future: "asyncio.Future[Food]" = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        # Shielded: a disconnecting client must not cancel the write of its queued row
+        return await asyncio.shield(future)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[_Pending]) -> None:
+        BATCH_ROWS.observe(len(batch))
+        if not await self._write(batch) and len(batch) > 1:
+            # One bad row must not fail its neighbours: retry each on its own
+            for pending in batch:
+                await self._write([pending])
+
+    async def _write(self, batch: List[_Pending]) -> bool:
+        try:
+            async with self._session_factory() as db:
+                created = await self.repo.create_entries(db, [row for row, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                _resolve(batch[0][1], error=e)
+            return False
+        for (_, future), food in zip(batch, created):
+            _resolve(future, result=food)
+        return True
+
+    async def aclose(self) -> None:
+        """Write whatever is queued and wait for running flushes (shutdown)."""
+        if self._pending:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+def _resolve(future: "asyncio.Future[Food]", *, result: Optional[Food] = None, error: Optional[BaseException] = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)  # type: ignore[arg-type]
+
+
+_settings = get_settings()
+
+# None unless CONSUME_WRITE_BEHIND is enabled
+consumption_writer: Optional[ConsumptionWriter] = (
+    ConsumptionWriter(
+        max_batch=_settings.CONSUME_BATCH_MAX_SIZE,
+        max_delay=_settings.CONSUME_BATCH_MAX_DELAY_MS / 1000.0,
+    )
+    if _settings.CONSUME_WRITE_BEHIND
+    else None
+)
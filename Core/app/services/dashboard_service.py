@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import TTLCache
+from ..core.config import get_settings
+from ..models.food import Food
+from ..repositories.food_repository import AsyncFoodRepository, portion
+from ..repositories.nutrition_rollup_repository import AsyncNutritionRollupRepository
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite returns naive UTC timestamps
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class RecentEntry:
+    id: str
+    barcode: str
+    name: str | None
+    grams: float
+    calories: float
+    scanned_at: datetime
+
+    @classmethod
+    def from_model(cls, food: Food) -> "RecentEntry":
+        return cls(
+            id=food.id,
+            barcode=food.barcode,
+            name=food.name,
+            grams=food.grams,
+            calories=portion(food.calories_per_100g, food.grams),
+            scanned_at=_as_utc(food.scanned_at),
+        )
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Immutable per-user home-screen data for one UTC day; replaced, never mutated."""
+
+    day: date
+    grams: float
+    calories: float
+    proteins: float
+    carbs: float
+    fats: float
+    entries: int
+    recent: Tuple[RecentEntry, ...]
+
+    def with_entries(self, foods: Iterable[Food], recent_limit: int) -> Optional["DashboardSnapshot"]:
+        """Snapshot including newly stored ``foods``, or None if one falls on another day."""
+        totals = {
+            "grams": self.grams,
+            "calories": self.calories,
+            "proteins": self.proteins,
+            "carbs": self.carbs,
+            "fats": self.fats,
+            "entries": self.entries,
+        }
+        recent = list(self.recent)
+        for food in foods:
+            entry = RecentEntry.from_model(food)
+            if entry.scanned_at.date() != self.day:
+                # e.g. an offline upload for yesterday: cheaper to rebuild than to reason about
+                return None
+            totals["grams"] += food.grams
+            totals["calories"] += entry.calories
+            totals["proteins"] += portion(food.proteins_per_100g, food.grams)
+            totals["carbs"] += portion(food.carbs_per_100g, food.grams)
+            totals["fats"] += portion(food.fats_per_100g, food.grams)
+            totals["entries"] += 1
+            recent.append(entry)
+        recent.sort(key=lambda item: (item.scanned_at, item.id), reverse=True)
+        return replace(self, **totals, recent=tuple(recent[:recent_limit]))
+
+
+class DashboardSnapshots:
+    """Per-user snapshot cache, kept current by ``record`` after each committed consume.
+
+    A build that raced with a consume must not cache its (older) result: ``record``
+    replaces the cache slot, and ``store`` only succeeds while the slot still holds
+    what the builder saw before reading. All calls happen on the event loop thread.
+    """
+
+    def __init__(self, cache: TTLCache[str, Any], recent_limit: int) -> None:
+        self.cache = cache
+        self.recent_limit = recent_limit
+
+    def get(self, user_id: str, day: date) -> Tuple[Optional[DashboardSnapshot], Any]:
+        """(snapshot for ``day`` or None, token to pass to ``store`` after a rebuild)."""
+        current = self.cache.get(user_id)
+        if isinstance(current, DashboardSnapshot) and current.day == day:
+            return current, current
+        return None, current
+
+    def store(self, user_id: str, snapshot: DashboardSnapshot, token: Any) -> None:
+        if self.cache.get(user_id) is token:
+            self.cache.set(user_id, snapshot)
+
+    def record(self, user_id: str, foods: Iterable[Food]) -> None:
+        """Fold newly committed entries into the user's snapshot (or invalidate it)."""
+        foods = list(foods)
+        if not foods:
+            return
+        current = self.cache.get(user_id)
+        updated = current.with_entries(foods, self.recent_limit) if isinstance(current, DashboardSnapshot) else None
+        # A fresh marker (instead of a plain delete) also voids builds in progress
+        self.cache.set(user_id, updated if updated is not None else object())
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+class DashboardService:
+    def __init__(
+        self,
+        food_repo: Optional[AsyncFoodRepository] = None,
+        rollups: Optional[AsyncNutritionRollupRepository] = None,
+        snapshots: Optional[DashboardSnapshots] = None,
+    ) -> None:
+        self.food_repo = food_repo if food_repo is not None else AsyncFoodRepository()
+        self.rollups = rollups if rollups is not None else AsyncNutritionRollupRepository()
+        self.snapshots = snapshots if snapshots is not None else dashboard_snapshots
+
+    async def snapshot(self, db: AsyncSession, user_id: str) -> DashboardSnapshot:
+        """Today's snapshot from the cache, else built from one rollup row and the newest entries."""
+        today = datetime.now(timezone.utc).date()
+        snapshot, token = self.snapshots.get(user_id, today)
+        if snapshot is not None:
+            return snapshot
+
+        rollup = await self.rollups.get_day(db, user_id=user_id, day=today)
+        recent = await self.food_repo.recent(db, user_id=user_id, limit=self.snapshots.recent_limit)
+        snapshot = DashboardSnapshot(
+            day=today,
+            grams=rollup.grams if rollup else 0.0,
+            calories=rollup.kcal if rollup else 0.0,
+            proteins=rollup.proteins if rollup else 0.0,
+            carbs=rollup.carbs if rollup else 0.0,
+            fats=rollup.fats if rollup else 0.0,
+            entries=rollup.entries if rollup else 0,
+            recent=tuple(RecentEntry.from_model(food) for food in recent),
+        )
+        self.snapshots.store(user_id, snapshot, token)
+        return snapshot
+
+    async def summary(self, db: AsyncSession, principal: Any) -> Dict[str, Any]:
+        """Home-screen payload: profile parts come from the principal, intake from the snapshot."""
+        snapshot = await self.snapshot(db, principal.id)
+        kcal_goal = principal.kcal_goal
+        return {
+            "show_onboarding": not principal.is_onboarded,
+            "day": snapshot.day,
+            "kcal_goal": kcal_goal,
+            "kcal_remaining": kcal_goal - snapshot.calories if kcal_goal is not None else None,
+            "today": {
+                "grams": snapshot.grams,
+                "calories": snapshot.calories,
+                "proteins": snapshot.proteins,
+                "carbs": snapshot.carbs,
+                "fats": snapshot.fats,
+                "entries": snapshot.entries,
+            },
+            "recent": snapshot.recent,
+        }
+
+
+_settings = get_settings()
+
+dashboard_snapshots = DashboardSnapshots(
+    TTLCache(maxsize=_settings.DASHBOARD_CACHE_MAXSIZE, ttl=_settings.DASHBOARD_CACHE_TTL_SECONDS),
+    recent_limit=_settings.DASHBOARD_RECENT_ITEMS,
+)
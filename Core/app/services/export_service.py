@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from typing import Callable, Iterable, Iterator, Literal, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..repositories.food_repository import EXPORT_FIELDS, FoodRepository
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _csv_chunks(rows: Iterable[Row], batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    # Header goes out before the query runs: fast first byte
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    pending = 0
+    for row in rows:
+        writer.writerow((row.id, row.scanned_at.isoformat(), *row[2:]))
+        pending += 1
+        if pending == batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(rows: Iterable[Row], batch_size: int) -> Iterator[bytes]:
+    lines = []
+    for row in rows:
+        record = row._asdict()
+        record["scanned_at"] = row.scanned_at.isoformat()
+        lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        if len(lines) == batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        # Sync flush per chunk so the client keeps receiving data while the export runs
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ExportService:
+    """Streams a user's consumption history as CSV or NDJSON in constant memory."""
+
+    def __init__(
+        self,
+        food_repo: Optional[FoodRepository] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 1000,
+    ) -> None:
+        self.food_repo = food_repo if food_repo is not None else FoodRepository()
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+
+    def stream(
+        self,
+        *,
+        user_id: str,
+        fmt: ExportFormat,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """Body chunks of the export, for a StreamingResponse.
+
+        The session is opened inside the generator: it lives exactly as long as the
+        response body is being sent, not as long as the request's dependencies.
+        """
+        def chunks() -> Iterator[bytes]:
+            with self._session_factory() as db:
+                rows = self.food_repo.iter_by_user(
+                    db, user_id=user_id, date_from=date_from, date_to=date_to, batch_size=self.batch_size
+                )
+                encode = _csv_chunks if fmt == "csv" else _ndjson_chunks
+                yield from encode(rows, self.batch_size)
+
+        return _gzip(chunks()) if compress else chunks()
@@ -1,100 +1,164 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..repositories.food_repository import FoodRepository
+from ..core.metrics import counter
+from ..repositories.food_repository import AsyncFoodRepository
+from .consumption_writer import ConsumptionWriter, consumption_writer
+from .dashboard_service import DashboardSnapshots, dashboard_snapshots
+from .openfoodfacts_client import (
+    OpenFoodFactsClient,
+    OpenFoodFactsError,
+    OpenFoodFactsUnavailable,
+    openfoodfacts_client,
+)
+from .product_catalog import ProductCatalog, ProductInfo, product_catalog
 
-try:
-    import openfoodfacts
-except Exception:  # pragma: no cover - optional dependency
-    openfoodfacts = None  # type: ignore
+LOOKUPS = counter("insho_food_lookups_total", "Barcode lookups by where they were answered.", ("source",))
+
+
+def _upstream_http_error(error: OpenFoodFactsError) -> HTTPException:
+    if isinstance(error, OpenFoodFactsUnavailable):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="OpenFoodFacts temporarily unavailable",
+            headers={"Retry-After": str(int(error.retry_after))},
+        )
+    return HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"OpenFoodFacts error: {error}")
 
 
 class FoodService:
-    def __init__(self, food_repo: FoodRepository):
+    def __init__(
+        self,
+        food_repo: AsyncFoodRepository,
+        catalog: Optional[ProductCatalog] = None,
+        upstream: Optional[OpenFoodFactsClient] = None,
+        writer: Optional[ConsumptionWriter] = None,
+        dashboards: Optional[DashboardSnapshots] = None,
+    ):
         self.food_repo = food_repo
+        self.catalog = catalog if catalog is not None else product_catalog
+        self.upstream = upstream if upstream is not None else openfoodfacts_client
+        # Group commit for single consumes (CONSUME_WRITE_BEHIND); None = commit per request
+        self.writer = writer if writer is not None else consumption_writer
+        self.dashboards = dashboards if dashboards is not None else dashboard_snapshots
 
-    def lookup_by_barcode(self, db: Session, barcode: str):
-        # Try DB first
-        food = self.food_repo.get_latest_by_barcode(db, barcode)
-        if food:
-            return food, "db"
+    async def lookup_by_barcode(self, db: AsyncSession, barcode: str):
+        product, source = await self._lookup(db, barcode)
+        LOOKUPS.inc(source)
+        return product, source
+
+    async def _lookup(self, db: AsyncSession, barcode: str):
+        # Try the product catalog first (in-process cache, then primary-key lookup)
+        product = await self.catalog.get(db, barcode)
+        if product is not None:
+            return product, "db"
+        if self.catalog.is_known_missing(barcode):
+            return None, "not_found"
 
-        # Fetch via OpenFoodFacts: prefer library if available, else HTTP API
-        product_data = None
+        # Fetch via OpenFoodFacts; concurrent lookups of the same barcode share one call
         try:
-            if openfoodfacts is not None and getattr(openfoodfacts, "products", None) is not None:
-                product_data = openfoodfacts.products.get_product(barcode)  # type: ignore[attr-defined]
-            else:
-                # Fallback to HTTP API
-                import json
-                from urllib.request import urlopen
-                from urllib.error import URLError, HTTPError
-                url = f"https://world.openfoodfacts.org/api/v0/product/{barcode}.json"
-                with urlopen(url, timeout=7) as resp:  # nosec B310 (fixed URL, read-only)
-                    product_data = json.loads(resp.read().decode("utf-8"))
-        except Exception as e:  # pragma: no cover
-            raise HTTPException(status_code=502, detail=f"OpenFoodFacts error: {e}")
-
-        if not product_data or product_data.get("status") != 1:
+            fetched = await self.upstream.get_product(barcode)
+        except OpenFoodFactsError as e:
+            raise _upstream_http_error(e)
+
+        if fetched is None:
+            self.catalog.remember_missing(barcode)
             return None, "not_found"
 
-        p = product_data.get("product", {})
-        name = p.get("product_name") or p.get("brands") or p.get("generic_name")
-        nutriments = p.get("nutriments", {})
-        # kcal may be in energy-kcal_100g else energy_100g (kJ), but we'll prefer kcal
-        cal = nutriments.get("energy-kcal_100g")
-        if cal is None and (nutriments.get("energy_100g") is not None or nutriments.get("energy-kj_100g") is not None):
-            # Convert kJ to kcal
-            try:
-                kj = nutriments.get("energy-kj_100g", nutriments.get("energy_100g"))
-                cal = float(kj) / 4.184 if kj is not None else None
-            except Exception:
-                cal = None
-        proteins = nutriments.get("proteins_100g")
-        carbs = nutriments.get("carbohydrates_100g")
-        fats = nutriments.get("fat_100g")
-
-        # For lookup we do not store a row yet; return a transient-like object
-        class _Lookup:
-            id = ""
-            barcode: str
-            name: str | None
-            calories_per_100g: float | None
-            proteins_per_100g: float | None
-            carbs_per_100g: float | None
-            fats_per_100g: float | None
-            def __init__(self):
-                self.barcode = barcode
-                self.name = name
-                self.calories_per_100g = float(cal) if cal is not None else None
-                self.proteins_per_100g = float(proteins) if proteins is not None else None
-                self.carbs_per_100g = float(carbs) if carbs is not None else None
-                self.fats_per_100g = float(fats) if fats is not None else None
-
-        return _Lookup(), "openfoodfacts"
-
-    def consume(self, db: Session, *, user_id: str, barcode: str, grams: float):
+        # Store in the catalog so subsequent lookups are served locally; a coalesced
+        # caller that finished first has usually stored it already
+        product = self.catalog.get_cached(barcode)
+        if product is None:
+            product = await self.catalog.save(db, fetched, source="openfoodfacts")
+        return product, "openfoodfacts"
+
+    async def consume(self, db: AsyncSession, *, user_id: str, barcode: str, grams: float):
         if grams <= 0:
             raise HTTPException(status_code=400, detail="grams must be > 0")
 
-        # Get nutrition info from latest known DB row or OpenFoodFacts
-        existing, source = self.lookup_by_barcode(db, barcode)
-        if not existing:
+        # Get nutrition info from the product catalog or OpenFoodFacts
+        product, source = await self.lookup_by_barcode(db, barcode)
+        if not product:
             raise HTTPException(status_code=404, detail="Food not found for given barcode")
 
-        created = self.food_repo.create_entry(
+        entry = {
+            "user_id": user_id,
+            "barcode": barcode,
+            "name": product.name,
+            "calories_per_100g": product.calories_per_100g,
+            "proteins_per_100g": product.proteins_per_100g,
+            "carbs_per_100g": product.carbs_per_100g,
+            "fats_per_100g": product.fats_per_100g,
+            "grams": grams,
+        }
+        if self.writer is not None:
+            # Release the request's connection before queueing; the batch uses its own session
+            await db.close()
+            created = await self.writer.submit(entry)
+        else:
+            created = await self.food_repo.create_entry(db, **entry)
+        self.dashboards.record(user_id, [created])
+        return created
+
+    async def resolve_many(self, db: AsyncSession, barcodes: Sequence[str]) -> Dict[str, ProductInfo]:
+        """Resolve many barcodes: one IN query, then one concurrent upstream round for the misses."""
+        products = await self.catalog.get_many(db, barcodes)
+        misses = [
+            barcode for barcode in dict.fromkeys(barcodes)
+            if barcode not in products and not self.catalog.is_known_missing(barcode)
+        ]
+        LOOKUPS.inc("db", amount=len(products))
+        if not misses:
+            return products
+
+        results = await asyncio.gather(
+            *(self.upstream.get_product(barcode) for barcode in misses), return_exceptions=True
+        )
+        fetched: List[ProductInfo] = []
+        for barcode, result in zip(misses, results):
+            if isinstance(result, OpenFoodFactsError):
+                raise _upstream_http_error(result)
+            if isinstance(result, BaseException):
+                raise result
+            if result is None:
+                self.catalog.remember_missing(barcode)
+            else:
+                fetched.append(result)
+        if fetched:
+            for product in await self.catalog.save_many(db, fetched, source="openfoodfacts"):
+                products[product.barcode] = product
+        return products
+
+    async def consume_many(self, db: AsyncSession, *, user_id: str, items: Sequence[Tuple[str, float]]):
+        """Record several (barcode, grams) items atomically: all rows are inserted or none."""
+        if any(grams <= 0 for _, grams in items):
+            raise HTTPException(status_code=400, detail="grams must be > 0")
+
+        products = await self.resolve_many(db, [barcode for barcode, _ in items])
+        unknown = sorted({barcode for barcode, _ in items if barcode not in products})
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Food not found for barcodes: {', '.join(unknown)}")
+
+        created = await self.food_repo.create_entries(
             db,
-            user_id=user_id,
-            barcode=barcode,
-            name=getattr(existing, "name", None),
-            calories_per_100g=getattr(existing, "calories_per_100g", None),
-            proteins_per_100g=getattr(existing, "proteins_per_100g", None),
-            carbs_per_100g=getattr(existing, "carbs_per_100g", None),
-            fats_per_100g=getattr(existing, "fats_per_100g", None),
-            grams=grams,
+            [
+                {
+                    "user_id": user_id,
+                    "barcode": barcode,
+                    "name": products[barcode].name,
+                    "calories_per_100g": products[barcode].calories_per_100g,
+                    "proteins_per_100g": products[barcode].proteins_per_100g,
+                    "carbs_per_100g": products[barcode].carbs_per_100g,
+                    "fats_per_100g": products[barcode].fats_per_100g,
+                    "grams": grams,
+                }
+                for barcode, grams in items
+            ],
         )
+        self.dashboards.record(user_id, created)
         return created
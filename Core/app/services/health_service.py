@@ -1,7 +1,12 @@
-from typing import Dict
+from typing import Any, Dict
 
 from ..repositories.health_repository import HealthRepository
 from ..core.config import get_settings
+from ..core.database import pool_stats
+from ..security.principal import principal_cache
+from .dashboard_service import dashboard_snapshots
+from .openfoodfacts_client import openfoodfacts_client
+from .product_catalog import product_catalog
 
 
 class HealthService:
@@ -9,10 +14,17 @@ class HealthService:
         self._repo = repo
         self._settings = get_settings()
 
-    def status(self) -> Dict[str, str]:
+    def status(self) -> Dict[str, Any]:
         repo_info = self._repo.ping()
+        upstream = openfoodfacts_client.breaker.snapshot()
         return {
-            "status": "ok",
+            # Lookups of uncached barcodes fail fast while the upstream circuit is open
+            "status": "ok" if upstream["state"] == "closed" else "degraded",
             "env": self._settings.ENV,
             **repo_info,
-        }
\ No newline at end of file
+            "db_pools": pool_stats(),
+            "product_cache": product_catalog.stats(),
+            "principal_cache": principal_cache.stats(),
+            "dashboard_cache": dashboard_snapshots.stats(),
+            "openfoodfacts": upstream,
+        }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+import httpx
+
+from ..core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..core.config import get_settings
+from ..core.metrics import counter, histogram
+from .product_catalog import ProductInfo
+
+
+UPSTREAM_CALLS = counter(
+    "insho_openfoodfacts_requests_total",
+    "OpenFoodFacts product requests by outcome (found, not_found, error, rejected, coalesced).",
+    ("outcome",),
+)
+UPSTREAM_SECONDS = histogram("insho_openfoodfacts_request_duration_seconds", "OpenFoodFacts request latency.")
+
+
+class OpenFoodFactsError(Exception):
+    """Raised when the upstream product API cannot be reached or answers with an error."""
+
+
+class OpenFoodFactsUnavailable(OpenFoodFactsError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("upstream temporarily unavailable")
+        self.retry_after = retry_after
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_product_info(barcode: str, product: Dict[str, Any]) -> ProductInfo:
+    """Map an OpenFoodFacts product document onto the catalog's nutrition fields."""
+    name = product.get("product_name") or product.get("brands") or product.get("generic_name")
+    nutriments = product.get("nutriments") or {}
+    # kcal may be in energy-kcal_100g else energy_100g (kJ), but we'll prefer kcal
+    cal = _to_float(nutriments.get("energy-kcal_100g"))
+    if cal is None:
+        # Convert kJ to kcal
+        kj = _to_float(nutriments.get("energy-kj_100g", nutriments.get("energy_100g")))
+        cal = kj / 4.184 if kj is not None else None
+    return ProductInfo(
+        barcode=barcode,
+        name=name or None,
+        calories_per_100g=cal,
+        proteins_per_100g=_to_float(nutriments.get("proteins_100g")),
+        carbs_per_100g=_to_float(nutriments.get("carbohydrates_100g")),
+        fats_per_100g=_to_float(nutriments.get("fat_100g")),
+    )
+
+
+class OpenFoodFactsClient:
+    """Async OpenFoodFacts client.
+
+    Keeps a pool of keep-alive connections, caps the number of concurrent upstream
+    requests and coalesces concurrent lookups of the same barcode into a single
+    upstream call (single-flight). Upstream errors feed a circuit breaker so a
+    degraded upstream is failed fast instead of being hammered.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: float = 7.0,
+        max_connections: int = 20,
+        max_in_flight: int = 10,
+        user_agent: str = "Insho",
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._max_in_flight = max_in_flight
+        self._user_agent = user_agent
+        self.breaker = breaker if breaker is not None else CircuitBreaker("openfoodfacts")
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: Dict[str, "asyncio.Task[Optional[ProductInfo]]"] = {}
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Connections and primitives are bound to the loop that created them
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                headers={"User-Agent": self._user_agent},
+            )
+            self._semaphore = asyncio.Semaphore(self._max_in_flight)
+            self._loop = loop
+            self._inflight.clear()
+        return self._client
+
+    async def get_product(self, barcode: str) -> Optional[ProductInfo]:
+        """Return the product for ``barcode`` or None if OpenFoodFacts does not know it."""
+        self._ensure_client()
+        task = self._inflight.get(barcode)
+        if task is None:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                UPSTREAM_CALLS.inc("rejected")
+                raise OpenFoodFactsUnavailable(e.retry_after) from e
+            task = asyncio.ensure_future(self._guarded_fetch(barcode))
+            self._inflight[barcode] = task
+            task.add_done_callback(lambda t: self._on_done(barcode, t))
+        else:
+            UPSTREAM_CALLS.inc("coalesced")
+        # Shield so one cancelled caller does not cancel the shared upstream call
+        return await asyncio.shield(task)
+
+    def _on_done(self, barcode: str, task: "asyncio.Task[Optional[ProductInfo]]") -> None:
+        if self._inflight.get(barcode) is task:
+            del self._inflight[barcode]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    async def _guarded_fetch(self, barcode: str) -> Optional[ProductInfo]:
+        started = time.perf_counter()
+        try:
+            result = await self._fetch(barcode)
+        except BaseException:
+            # Errors and cancellations both release the breaker slot as a failure
+            self.breaker.record_failure()
+            UPSTREAM_CALLS.inc("error")
+            raise
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started)
+        # "Not found" is a healthy answer from upstream
+        self.breaker.record_success()
+        UPSTREAM_CALLS.inc("found" if result is not None else "not_found")
+        return result
+
+    async def _fetch(self, barcode: str) -> Optional[ProductInfo]:
+        client = self._ensure_client()
+        assert self._semaphore is not None
+        async with self._semaphore:
+            try:
+                resp = await client.get(f"/api/v0/product/{quote(barcode, safe='')}.json")
+            except httpx.HTTPError as e:
+                raise OpenFoodFactsError(str(e) or type(e).__name__) from e
+        if resp.status_code == 404:
+            return None
+        if resp.status_code >= 400:
+            raise OpenFoodFactsError(f"upstream returned HTTP {resp.status_code}")
+        try:
+            product_data = resp.json()
+        except ValueError as e:
+            raise OpenFoodFactsError("upstream returned invalid JSON") from e
+        if not product_data or product_data.get("status") != 1:
+            return None
+        return extract_product_info(barcode, product_data.get("product") or {})
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        self._loop = None
+        if client is not None:
+            await client.aclose()
+
+
+_settings = get_settings()
+
+# Process-wide singleton so keep-alive connections are shared by all requests
+openfoodfacts_client = OpenFoodFactsClient(
+    _settings.OPENFOODFACTS_BASE_URL,
+    timeout=_settings.OPENFOODFACTS_TIMEOUT_SECONDS,
+    max_connections=_settings.OPENFOODFACTS_MAX_CONNECTIONS,
+    max_in_flight=_settings.OPENFOODFACTS_MAX_IN_FLIGHT,
+    user_agent=f"{_settings.PROJECT_NAME}/{_settings.VERSION}",
+    breaker=CircuitBreaker(
+        "openfoodfacts",
+        failure_threshold=_settings.OPENFOODFACTS_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout=_settings.OPENFOODFACTS_BREAKER_RECOVERY_SECONDS,
+        half_open_max_calls=_settings.OPENFOODFACTS_BREAKER_PROBE_CALLS,
+    ),
+)
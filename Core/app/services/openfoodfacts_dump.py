@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import sys
+from dataclasses import replace
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, Literal, Optional
+
+from .openfoodfacts_client import extract_product_info
+from .product_catalog import ProductInfo
+
+DumpFormat = Literal["jsonl", "csv"]
+
+# Flat CSV/TSV export columns that extract_product_info reads from ``nutriments``
+_CSV_NUTRIMENTS = (
+    "energy-kcal_100g",
+    "energy-kj_100g",
+    "energy_100g",
+    "proteins_100g",
+    "carbohydrates_100g",
+    "fat_100g",
+)
+
+
+def detect_format(path: str) -> DumpFormat:
+    name = path.lower().removesuffix(".gz")
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if name.endswith((".csv", ".tsv")):
+        return "csv"
+    raise ValueError(f"cannot infer dump format from {path!r}; pass --format")
+
+
+def _open_text(path: str) -> IO[str]:
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, "rt", encoding="utf-8", errors="replace", newline="")
+
+
+def _csv_rows(stream: IO[str]) -> Iterator[Dict[str, str]]:
+    # The official export is tab-separated with very long text fields
+    csv.field_size_limit(sys.maxsize)
+    header = stream.readline()
+    delimiter = "\t" if "\t" in header else ","
+    fields = next(csv.reader([header], delimiter=delimiter))
+    return csv.DictReader(stream, fieldnames=fields, delimiter=delimiter, quoting=csv.QUOTE_NONE if delimiter == "\t" else csv.QUOTE_MINIMAL)
+
+
+def _from_json_line(line: str) -> Optional[ProductInfo]:
+    if not line.strip():
+        return None
+    try:
+        product = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(product, dict):
+        return None
+    return _to_info(product.get("code") or product.get("_id"), product)
+
+
+def _from_csv_row(row: Dict[str, Any]) -> Optional[ProductInfo]:
+    product = {
+        "product_name": row.get("product_name"),
+        "brands": row.get("brands"),
+        "generic_name": row.get("generic_name"),
+        # Absent/empty cells must stay missing so the kJ fallback applies
+        "nutriments": {key: row[key] for key in _CSV_NUTRIMENTS if row.get(key)},
+    }
+    return _to_info(row.get("code"), product)
+
+
+def _to_info(code: Any, product: Dict[str, Any]) -> Optional[ProductInfo]:
+    barcode = str(code).strip() if code is not None else ""
+    if not barcode or len(barcode) > 64:
+        return None
+    info = extract_product_info(barcode, product)
+    if info.name is not None and len(info.name) > 512:
+        info = replace(info, name=info.name[:512])
+    return info
+
+
+def iter_dump(path: str, fmt: DumpFormat, *, offset: int = 0) -> Iterator[Optional[ProductInfo]]:
+    """Stream a product dump record by record, starting at record ``offset``.
+
+    Yields one item per record (None for records that are unusable), so the
+    number of items consumed is the offset to resume from. Memory use does not
+    depend on the dump size.
+    """
+    with _open_text(path) as stream:
+        if fmt == "jsonl":
+            # Skipped lines are not JSON-decoded
+            for line in islice(stream, offset, None):
+                yield _from_json_line(line)
+        else:
+            for row in islice(_csv_rows(stream), offset, None):
+                yield _from_csv_row(row)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import TTLCache
+from ..core.conditional import make_etag
+from ..core.config import get_settings
+from ..models.product import Product
+from ..repositories.product_repository import AsyncProductRepository
+
+
+@dataclass(frozen=True)
+class ProductInfo:
+    """Immutable snapshot of a catalog product; safe to share across requests and threads."""
+
+    barcode: str
+    name: str | None
+    calories_per_100g: float | None
+    proteins_per_100g: float | None
+    carbs_per_100g: float | None
+    fats_per_100g: float | None
+    updated_at: datetime | None = None
+
+    @classmethod
+    def from_model(cls, product: Product) -> "ProductInfo":
+        return cls(
+            barcode=product.barcode,
+            name=product.name,
+            calories_per_100g=product.calories_per_100g,
+            proteins_per_100g=product.proteins_per_100g,
+            carbs_per_100g=product.carbs_per_100g,
+            fats_per_100g=product.fats_per_100g,
+            updated_at=product.updated_at,
+        )
+
+    @cached_property
+    def etag(self) -> str:
+        """Version of the record (its fields incl. ``updated_at``) for conditional lookups."""
+        return make_etag(*(getattr(self, f.name) for f in fields(self)))
+
+
+class ProductCatalog:
+    """Barcode -> nutrition resolution: in-process LRU/TTL cache in front of the products table."""
+
+    def __init__(
+        self,
+        repo: AsyncProductRepository,
+        cache: TTLCache[str, ProductInfo],
+        missing: TTLCache[str, bool],
+    ) -> None:
+        self._repo = repo
+        self.cache = cache
+        # Negative cache: barcodes upstream reported as unknown
+        self.missing = missing
+
+    def get_cached(self, barcode: str) -> Optional[ProductInfo]:
+        return self.cache.get(barcode)
+
+    async def get(self, db: AsyncSession, barcode: str) -> Optional[ProductInfo]:
+        cached = self.get_cached(barcode)
+        if cached is not None:
+            return cached
+        return await self.load(db, barcode)
+
+    async def load(self, db: AsyncSession, barcode: str) -> Optional[ProductInfo]:
+        """Read ``barcode`` from the products table (bypassing the cache) and cache it."""
+        product = await self._repo.get(db, barcode)
+        if product is None:
+            return None
+        info = ProductInfo.from_model(product)
+        self.cache.set(barcode, info)
+        return info
+
+    async def get_many(self, db: AsyncSession, barcodes: Iterable[str]) -> Dict[str, ProductInfo]:
+        """Resolve many barcodes: cache first, then a single IN query for the rest."""
+        found: Dict[str, ProductInfo] = {}
+        pending: List[str] = []
+        for barcode in dict.fromkeys(barcodes):
+            cached = self.get_cached(barcode)
+            if cached is not None:
+                found[barcode] = cached
+            else:
+                pending.append(barcode)
+        for product in await self._repo.get_many(db, pending):
+            info = ProductInfo.from_model(product)
+            self.cache.set(info.barcode, info)
+            found[info.barcode] = info
+        return found
+
+    async def search(self, db: AsyncSession, query: str, *, limit: int = 20) -> List[ProductInfo]:
+        """Ranked name search over the local catalog (uncached; results vary per prefix)."""
+        return [ProductInfo.from_model(product) for product in await self._repo.search(db, query, limit=limit)]
+
+    def is_known_missing(self, barcode: str) -> bool:
+        return self.missing.get(barcode, False) is True
+
+    def remember_missing(self, barcode: str) -> None:
+        self.missing.set(barcode, True)
+
+    async def save(self, db: AsyncSession, info: ProductInfo, *, source: str) -> ProductInfo:
+        product = await self._repo.upsert(
+            db,
+            barcode=info.barcode,
+            name=info.name,
+            calories_per_100g=info.calories_per_100g,
+            proteins_per_100g=info.proteins_per_100g,
+            carbs_per_100g=info.carbs_per_100g,
+            fats_per_100g=info.fats_per_100g,
+            source=source,
+        )
+        saved = ProductInfo.from_model(product)
+        self.cache.set(saved.barcode, saved)
+        self.missing.pop(saved.barcode)
+        return saved
+
+    async def save_many(self, db: AsyncSession, infos: List[ProductInfo], *, source: str) -> List[ProductInfo]:
+        """Store several products with one upsert and one commit."""
+        products = await self._repo.upsert_many(
+            db,
+            [
+                {
+                    "barcode": info.barcode,
+                    "name": info.name,
+                    "calories_per_100g": info.calories_per_100g,
+                    "proteins_per_100g": info.proteins_per_100g,
+                    "carbs_per_100g": info.carbs_per_100g,
+                    "fats_per_100g": info.fats_per_100g,
+                    "source": source,
+                }
+                for info in infos
+            ],
+        )
+        saved = [ProductInfo.from_model(product) for product in products]
+        for info in saved:
+            self.cache.set(info.barcode, info)
+            self.missing.pop(info.barcode)
+        return saved
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "negative": self.missing.stats()}
+
+
+_settings = get_settings()
+
+# Process-wide singleton; FoodService instances are created per request
+product_catalog = ProductCatalog(
+    AsyncProductRepository(),
+    TTLCache(maxsize=_settings.PRODUCT_CACHE_MAXSIZE, ttl=_settings.PRODUCT_CACHE_TTL_SECONDS),
+    TTLCache(maxsize=_settings.PRODUCT_NEGATIVE_CACHE_MAXSIZE, ttl=_settings.PRODUCT_NEGATIVE_CACHE_TTL_SECONDS),
+)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..repositories.food_repository import AsyncFoodRepository
+from ..repositories.user_repository import AsyncUserRepository
+from ..schemas.sync import SyncEntryUpload
+from .food_service import FoodService
+
+
+class SyncService:
+    """Delta sync for offline-first clients.
+
+    The cursor is the user's change sequence (``users.change_seq``) as of the last
+    sync. Every write to the user's entries or profile takes the next sequence in
+    the same transaction, so "changed since cursor" is an index range scan.
+    """
+
+    def __init__(self, food_service: FoodService, food_repo: AsyncFoodRepository, user_repo: AsyncUserRepository):
+        self.food_service = food_service
+        self.food_repo = food_repo
+        self.user_repo = user_repo
+
+    async def upload(self, db: AsyncSession, *, user_id: str, entries: Sequence[SyncEntryUpload]) -> Dict[str, Any]:
+        """Store queued offline entries once each, keyed by their client-generated id."""
+        owners = await self.food_repo.existing_owners(db, [entry.id for entry in entries])
+        accepted: List[str] = []
+        rejected: List[Dict[str, str]] = []
+        pending: Dict[str, SyncEntryUpload] = {}
+        for entry in entries:
+            owner = owners.get(entry.id)
+            if owner == user_id or entry.id in pending:
+                accepted.append(entry.id)  # already stored by an earlier attempt
+            elif owner is not None:
+                rejected.append({"id": entry.id, "reason": "id_conflict"})
+            else:
+                pending[entry.id] = entry
+
+        if not pending:
+            return {"accepted": accepted, "rejected": rejected}
+
+        products = await self.food_service.resolve_many(db, [entry.barcode for entry in pending.values()])
+        now = datetime.now(timezone.utc)
+        rows = []
+        for entry in pending.values():
+            product = products.get(entry.barcode)
+            if product is None:
+                rejected.append({"id": entry.id, "reason": "unknown_barcode"})
+                continue
+            scanned_at = entry.scanned_at if entry.scanned_at.tzinfo else entry.scanned_at.replace(tzinfo=timezone.utc)
+            rows.append(
+                {
+                    "id": entry.id,
+                    "user_id": user_id,
+                    "barcode": entry.barcode,
+                    "name": product.name,
+                    "calories_per_100g": product.calories_per_100g,
+                    "proteins_per_100g": product.proteins_per_100g,
+                    "carbs_per_100g": product.carbs_per_100g,
+                    "fats_per_100g": product.fats_per_100g,
+                    "grams": entry.grams,
+                    # Client clocks may run ahead; never record an entry in the future
+                    "scanned_at": min(scanned_at, now),
+                }
+            )
+        if rows:
+            try:
+                created = await self.food_repo.create_entries(db, rows)
+            except IntegrityError:
+                # A concurrent sync stored the same ids first; the client simply retries
+                await db.rollback()
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Concurrent sync, please retry")
+            self.food_service.dashboards.record(user_id, created)
+            accepted.extend(row["id"] for row in rows)
+        return {"accepted": accepted, "rejected": rejected}
+
+    async def changes(self, db: AsyncSession, *, user_id: str, cursor: Optional[int], limit: int) -> Dict[str, Any]:
+        """Entries and profile changed after ``cursor`` plus the cursor to send next time."""
+        user = await self.user_repo.get_by_id(db, user_id, fresh=True)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        after = cursor or 0
+        # Upper bound: entries committed after the user row was read belong to the next sync
+        entries = await self.food_repo.changes_since(
+            db, user_id=user_id, after=after, upto=user.change_seq, limit=limit + 1
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        new_cursor = entries[-1].change_seq if has_more else max(user.change_seq, after)
+        profile_changed = cursor is None or user.profile_seq > after
+        return {
+            "cursor": new_cursor,
+            "has_more": has_more,
+            "profile": user if profile_changed else None,
+            "entries": entries,
+        }
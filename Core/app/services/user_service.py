@@ -1,36 +1,55 @@
 from __future__ import annotations
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..repositories.user_repository import UserRepository
+from ..repositories.user_repository import AsyncUserRepository
 from ..schemas.user import UserCreate
-from ..security.auth import get_password_hash, verify_password
+from ..security.password_hasher import HashingOverloaded, PasswordHasher, password_hasher
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
 
 
 class UserService:
-    def __init__(self, repo: UserRepository) -> None:
+    def __init__(self, repo: AsyncUserRepository, hasher: PasswordHasher | None = None) -> None:
         self._repo = repo
+        self._hasher = hasher if hasher is not None else password_hasher
 
-    def register(self, db: Session, data: UserCreate):
+    async def register(self, db: AsyncSession, data: UserCreate):
         # Normalize email to lowercase to avoid duplicate variants
         normalized_email = data.email.strip().lower()
-        existing = self._repo.get_by_email(db, normalized_email)
+        existing = await self._repo.get_by_email(db, normalized_email)
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        hashed = get_password_hash(data.password)
-        user = self._repo.create(db, email=normalized_email, hashed_password=hashed, name=data.name)
+        try:
+            hashed = await self._hasher.hash(data.password)
+        except HashingOverloaded:
+            raise _overloaded()
+        user = await self._repo.create(db, email=normalized_email, hashed_password=hashed, name=data.name)
         return user
 
-    def authenticate(self, db: Session, email: str, password: str):
-        user = self._repo.get_by_email(db, email)
+    async def authenticate(self, db: AsyncSession, email: str, password: str):
+        user = await self._repo.get_by_email(db, email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        try:
+            valid, new_hash = await self._hasher.verify_and_update(password, user.hashed_password)
+        except HashingOverloaded:
+            raise _overloaded()
+        if not valid:
             return None
         if not user.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+        if new_hash is not None:
+            # Stored hash uses an outdated cost; upgrade it while we know the password
+            user = await self._repo.update_password_hash(db, user, new_hash)
         return user
@@ -0,0 +1,128 @@
+"""Micro-benchmark of the JSON response paths.
+
+Serializes typical payloads (built from transient ORM rows, no database needed)
+through the default encoding paths and through ``Core.app.core.responses`` and
+prints the time per response.
+
+Usage (from the repo root):
+    python -m Core.benchmarks.serialization [--items 50] [--repeat 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from Core.app.core.responses import FastJSONResponse, serialize, type_adapter
+from Core.app.models.food import Food
+from Core.app.models.user import User
+from Core.app.schemas.food import FoodListResponse, FoodRead
+from Core.app.schemas.user import UserRead
+
+
+def _foods(count: int) -> List[Food]:
+    now = datetime.now(timezone.utc)
+    user_id = str(uuid.uuid4())
+    return [
+        Food(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            barcode=f"40000{i:08d}",
+            name=f"Product {i}",
+            calories_per_100g=250.0 + i,
+            proteins_per_100g=8.5,
+            carbs_per_100g=31.0,
+            fats_per_100g=12.25,
+            grams=125.0,
+            scanned_at=now - timedelta(minutes=i),
+            change_seq=i,
+        )
+        for i in range(count)
+    ]
+
+
+def _user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=str(uuid.uuid4()), email="bench@example.com", hashed_password="x", name="Bench",
+        is_active=True, is_onboarded=True, age=30, height=180, weight=75, gender="other",
+        kcal_goal=2200, activity_level="moderate", created_at=now, updated_at=now,
+    )
+
+
+def _starlette_dumps(content: Any) -> bytes:
+    # What JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _python_mode(model_type: Any) -> Callable[[Any], bytes]:
+    # response_model without the dump_json fast path: validate, dump to python (json mode), json.dumps
+    adapter = type_adapter(model_type)
+    return lambda value: _starlette_dumps(adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json"))
+
+
+def _uncached(model_type: Any) -> Callable[[Any], bytes]:
+    # A TypeAdapter built per response, reading the ORM rows through their attributes
+    def run(value: Any) -> bytes:
+        adapter = TypeAdapter(model_type)
+        return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return run
+
+
+def _cases(items: int) -> List[Tuple[str, Any, Dict[str, Callable[[Any], bytes]]]]:
+    foods = _foods(items)
+    totals = {"grams": 1234.5, "calories": 2210.25, "proteins": 95.5, "carbs": 260.0, "fats": 70.75}
+    return [
+        ("UserRead", _user(), {
+            "python mode + json.dumps": _python_mode(UserRead),
+            "TypeAdapter per call, attributes": _uncached(UserRead),
+            "responses.serialize": lambda value: serialize(UserRead, value),
+        }),
+        ("FoodRead", foods[0], {
+            "python mode + json.dumps": _python_mode(FoodRead),
+            "TypeAdapter per call, attributes": _uncached(FoodRead),
+            "responses.serialize": lambda value: serialize(FoodRead, value),
+        }),
+        (f"FoodListResponse[{items}]", {"items": foods, "next_cursor": "abc"}, {
+            "python mode + json.dumps": _python_mode(FoodListResponse),
+            "TypeAdapter per call, attributes": _uncached(FoodListResponse),
+            "responses.serialize": lambda value: serialize(FoodListResponse, value),
+        }),
+        ("totals dict", totals, {
+            "jsonable_encoder + json.dumps": lambda value: _starlette_dumps(jsonable_encoder(value)),
+            "FastJSONResponse (orjson)": lambda value: FastJSONResponse(value).body,
+        }),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50, help="entries in the list payload")
+    parser.add_argument("--repeat", type=int, default=2000, help="serializations per measurement")
+    args = parser.parse_args(argv)
+
+    for name, value, paths in _cases(args.items):
+        print(name)
+        expected = None
+        baseline = None
+        for label, run in paths.items():
+            body = run(value)
+            # Every path must produce the same document
+            if expected is None:
+                expected = json.loads(body)
+            elif json.loads(body) != expected:
+                raise SystemExit(f"{name}: {label} produced a different document")
+            per_call = min(timeit.repeat(lambda: run(value), number=args.repeat, repeat=3)) / args.repeat
+            baseline = baseline or per_call
+            print(f"  {label:<34} {per_call * 1e6:9.1f} µs  ({baseline / per_call:4.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""Local stand-in for the OpenFoodFacts product API used by the benchmarks.
+
+Serves ``GET /api/v0/product/{barcode}.json`` with a fixed latency:
+barcodes starting with ``0000`` are unknown (status 0), all others return a product.
+
+Usage (from the repo root):
+    python -m Core.benchmarks.upstream_stub --port 8765 --latency-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _product(barcode: str) -> dict:
+    return {
+        "status": 1,
+        "product": {
+            "product_name": f"Benchmark product {barcode}",
+            "nutriments": {
+                "energy-kcal_100g": 100 + int(barcode[-2:] or 0),
+                "proteins_100g": 5.0,
+                "carbohydrates_100g": 12.5,
+                "fat_100g": 3.2,
+            },
+        },
+    }
+
+
+def _handler(latency: float) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            if not self.path.startswith("/api/v0/product/"):
+                self.send_error(404)
+                return
+            barcode = self.path.rsplit("/", 1)[-1].removesuffix(".json")
+            if latency:
+                time.sleep(latency)
+            body = json.dumps({"status": 0} if barcode.startswith("0000") else _product(barcode)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return Handler
+
+
+def start(port: int, latency_ms: float = 50.0) -> ThreadingHTTPServer:
+    """Serve the stub on a daemon thread; call ``shutdown()`` on the result to stop it."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(latency_ms / 1000.0))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="upstream-stub", daemon=True).start()
+    return server
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+    server = start(args.port, args.latency_ms)
+    print(f"✅ OpenFoodFacts stub on http://127.0.0.1:{args.port} ({args.latency_ms:g} ms latency)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
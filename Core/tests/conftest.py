@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Settings are read once at import: point the app at a throwaway SQLite file first
+_tmp = tempfile.mkdtemp(prefix="insho-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'test.db')}")
+os.environ.setdefault("ENV", "test")
+
+# Tests import the app as ``Core.app`` (like the commands and benchmarks, from the repo root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -0,0 +1,78 @@
+import pytest
+
+from Core.app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    return CircuitBreaker("upstream", failure_threshold=3, recovery_timeout=30.0, clock=clock, **kwargs)
+
+
+def _fail(breaker, times=1):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures_only():
+    breaker = _breaker(FakeClock())
+    _fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success()  # resets the consecutive count
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    _fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert raised.value.retry_after == pytest.approx(30.0)
+    assert breaker.rejected == 1
+
+
+def test_half_opens_when_the_cooldown_expires():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+
+    clock.now += 29.9
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 0.1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_successful_probe_closes_the_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    clock.now += 30.0
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # one probe at a time
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def test_failed_probe_reopens_for_another_cooldown():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _fail(breaker, 3)
+    clock.now += 30.0
+
+    _fail(breaker)  # the probe
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()["retry_in_seconds"] == 30.0
+    clock.now += 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
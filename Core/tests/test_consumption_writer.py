@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from Core.app.services.consumption_writer import ConsumptionWriter
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRepo:
+    """Records each create_entries call; a batch containing a ``bad`` row fails as a whole."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def create_entries(self, db, rows):
+        self.calls.append([row["barcode"] for row in rows])
+        await asyncio.sleep(0)
+        if any(row.get("bad") for row in rows):
+            raise ValueError("constraint violated")
+        return [SimpleNamespace(**row) for row in rows]
+
+
+def _writer(repo, *, max_batch=100, max_delay=10.0):
+    return ConsumptionWriter(max_batch=max_batch, max_delay=max_delay, repo=repo, session_factory=FakeSession)
+
+
+def test_full_batch_is_written_without_waiting_for_the_delay():
+    repo = FakeRepo()
+
+    async def run():
+        writer = _writer(repo, max_batch=3)
+        return await asyncio.wait_for(
+            asyncio.gather(*(writer.submit({"barcode": str(i)}) for i in range(3))), timeout=1.0
+        )
+
+    created = asyncio.run(run())
+    assert repo.calls == [["0", "1", "2"]]
+    assert [food.barcode for food in created] == ["0", "1", "2"]
+
+
+def test_partial_batch_is_written_after_the_delay():
+    repo = FakeRepo()
+
+    async def run():
+        writer = _writer(repo, max_delay=0.02)
+        return await asyncio.gather(writer.submit({"barcode": "a"}), writer.submit({"barcode": "b"}))
+
+    created = asyncio.run(run())
+    assert repo.calls == [["a", "b"]]
+    assert all(food.scanned_at is not None for food in created)
+
+
+def test_failed_batch_is_retried_row_by_row_and_fails_only_the_bad_row():
+    repo = FakeRepo()
+
+    async def run():
+        writer = _writer(repo, max_batch=3)
+        return await asyncio.gather(
+            writer.submit({"barcode": "a"}),
+            writer.submit({"barcode": "b", "bad": True}),
+            writer.submit({"barcode": "c"}),
+            return_exceptions=True,
+        )
+
+    first, bad, last = asyncio.run(run())
+    assert repo.calls == [["a", "b", "c"], ["a"], ["b"], ["c"]]
+    assert first.barcode == "a" and last.barcode == "c"
+    assert isinstance(bad, ValueError)
+
+
+def test_cancelled_caller_does_not_cancel_the_write():
+    repo = FakeRepo()
+
+    async def run():
+        writer = _writer(repo, max_delay=0.01)
+        caller = asyncio.ensure_future(writer.submit({"barcode": "a"}))
+        neighbour = asyncio.ensure_future(writer.submit({"barcode": "b"}))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        return await neighbour
+
+    assert asyncio.run(run()).barcode == "b"
+    assert repo.calls == [["a", "b"]]
+
+
+def test_aclose_writes_queued_rows():
+    repo = FakeRepo()
+
+    async def run():
+        writer = _writer(repo, max_delay=60.0)
+        pending = asyncio.ensure_future(writer.submit({"barcode": "a"}))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(writer.aclose(), timeout=1.0)
+        return await pending
+
+    assert asyncio.run(run()).barcode == "a"
+    assert repo.calls == [["a"]]
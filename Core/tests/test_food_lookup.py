@@ -0,0 +1,26 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from Core.app.commands import import_openfoodfacts
+from Core.app.main import app
+
+
+def test_only_get_lookup_answers_if_none_match(tmp_path):
+    dump = tmp_path / "dump.jsonl"
+    dump.write_text(json.dumps({"code": "4000000000017", "product_name": "Oat drink"}) + "\n")
+
+    with TestClient(app) as client:
+        assert import_openfoodfacts.main([str(dump)]) == 0
+        first = client.get("/api/v1/food/lookup/4000000000017")
+        etag = first.headers["ETag"]
+        cached = client.get("/api/v1/food/lookup/4000000000017", headers={"If-None-Match": etag})
+        posted = client.post(
+            "/api/v1/food/lookup", json={"barcode": "4000000000017"}, headers={"If-None-Match": etag}
+        )
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert posted.status_code == 200
+    assert posted.json()["food"]["name"] == "Oat drink"
+    assert "ETag" not in posted.headers
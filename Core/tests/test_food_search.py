@@ -0,0 +1,49 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, text, update
+from sqlalchemy.orm import Session
+
+from Core.app.commands import import_openfoodfacts
+from Core.app.core.search_index import ensure_product_search_index
+from Core.app.main import app
+from Core.app.models.product import Product
+from Core.app.repositories.product_repository import _search_statement
+
+
+def test_search_returns_imported_products_with_short_barcodes(tmp_path):
+    dump = tmp_path / "dump.jsonl"
+    dump.write_text(json.dumps({"code": "123", "product_name": "Chocolate spread"}) + "\n")
+
+    with TestClient(app) as client:
+        assert import_openfoodfacts.main([str(dump)]) == 0
+        resp = client.get("/api/v1/food/search", params={"q": "choc"})
+
+    assert resp.status_code == 200
+    assert [item["barcode"] for item in resp.json()["items"]] == ["123"]
+
+
+def test_search_index_survives_renumbered_product_rowids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Product.__table__.create(bind=engine)
+    ensure_product_search_index(engine)
+    with Session(engine) as db:
+        db.add_all(Product(barcode=f"400000000{i:04d}", name=f"Product {i} {word}") for i, word in enumerate(
+            ("apple", "banana", "cherry", "damson")
+        ))
+        db.commit()
+        db.execute(delete(Product).where(Product.barcode.in_(["4000000000000", "4000000000001"])))
+        db.execute(update(Product).where(Product.barcode == "4000000000003").values(name="Product 3 elderberry"))
+        db.commit()
+    with engine.begin() as conn:
+        # What VACUUM may do to a table without an INTEGER PRIMARY KEY: renumber its rowids
+        conn.execute(text("UPDATE products SET rowid = rowid + 100"))
+
+    def search(query):
+        with Session(engine) as db:
+            return [product.barcode for product in db.scalars(_search_statement("sqlite", query, 10))]
+
+    assert search("cherry") == ["4000000000002"]
+    assert search("elderberry") == ["4000000000003"]
+    assert search("damson") == []
+    assert search("apple") == []
@@ -0,0 +1,136 @@
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from Core.app.core.database import Base
+from Core.app.migration.sqlite_upgrade import upgrade_sqlite_schema
+from Core.app.models.food import Food
+from Core.app.models.user import User
+from Core.app.repositories.food_repository import FoodRepository
+
+# Tables as created by create_all before the delta-sync columns existed
+BASELINE_SCHEMA = (
+    """
+    CREATE TABLE users (
+        id VARCHAR(36) NOT NULL,
+        email VARCHAR(320) NOT NULL,
+        hashed_password VARCHAR(256) NOT NULL,
+        name VARCHAR(120),
+        gender VARCHAR(16),
+        activity_level VARCHAR(32),
+        age INTEGER,
+        height INTEGER,
+        weight INTEGER,
+        kcal_goal INTEGER,
+        is_active BOOLEAN NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        is_onboarded BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_users_email UNIQUE (email)
+    )
+    """,
+    "CREATE INDEX ix_users_email ON users (email)",
+    """
+    CREATE TABLE foods (
+        id VARCHAR(36) NOT NULL,
+        barcode VARCHAR(64) NOT NULL,
+        name VARCHAR(512),
+        calories_per_100g FLOAT,
+        proteins_per_100g FLOAT,
+        carbs_per_100g FLOAT,
+        fats_per_100g FLOAT,
+        user_id VARCHAR(36) NOT NULL,
+        grams FLOAT NOT NULL,
+        scanned_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX ix_foods_user_id ON foods (user_id)",
+    "CREATE INDEX ix_foods_barcode ON foods (barcode)",
+)
+
+
+def _baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        for user_id in ("u1", "u2"):
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, email, hashed_password, is_active, is_onboarded) "
+                    "VALUES (:id, :email, 'x', 1, 1)"
+                ),
+                {"id": user_id, "email": f"{user_id}@example.com"},
+            )
+        for food_id, user_id, scanned_at in (
+            ("f3", "u1", "2025-01-01 10:00:02"),
+            ("f1", "u1", "2025-01-01 10:00:00"),
+            ("f2", "u1", "2025-01-01 10:00:01"),
+            ("f4", "u2", "2025-01-02 08:00:00"),
+        ):
+            conn.execute(
+                text(
+                    "INSERT INTO foods (id, barcode, user_id, grams, scanned_at) "
+                    "VALUES (:id, '4000000000017', :user_id, 100, :scanned_at)"
+                ),
+                {"id": food_id, "user_id": user_id, "scanned_at": scanned_at},
+            )
+    return engine
+
+
+def _upgrade(engine):
+    Base.metadata.create_all(bind=engine)
+    upgrade_sqlite_schema(engine)
+
+
+def test_upgrade_adds_and_backfills_change_sequences(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    _upgrade(engine)
+
+    with Session(engine) as db:
+        users = {user.id: user for user in db.scalars(select(User))}
+        foods = {food.id: food.change_seq for food in db.scalars(select(Food))}
+
+    assert foods == {"f1": 1, "f2": 2, "f3": 3, "f4": 1}
+    assert (users["u1"].change_seq, users["u1"].profile_seq) == (3, 0)
+    assert (users["u2"].change_seq, users["u2"].profile_seq) == (1, 0)
+    with engine.connect() as conn:
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(foods)"))}
+    assert "ix_foods_user_id_change_seq" in indexes
+
+
+def test_upgrade_is_idempotent(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    _upgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET change_seq = 7 WHERE id = 'u1'"))
+    _upgrade(engine)
+
+    with Session(engine) as db:
+        assert db.get(User, "u1").change_seq == 7
+
+
+def test_history_pages_across_equal_legacy_timestamps(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    with engine.begin() as conn:
+        for i in range(6):
+            conn.execute(
+                text(
+                    "INSERT INTO foods (id, barcode, user_id, grams, scanned_at) "
+                    "VALUES (:id, '4000000000017', 'u2', 100, '2025-01-01 10:00:00')"
+                ),
+                {"id": f"id{i}"},
+            )
+    _upgrade(engine)
+
+    repo, seen, after = FoodRepository(), [], None
+    with Session(engine) as db:
+        for _ in range(10):
+            page, after = repo.history_by_user(db, user_id="u2", limit=2, after=after)
+            seen += [food.id for food in page]
+            if after is None:
+                break
+
+    assert seen == ["f4", "id5", "id4", "id3", "id2", "id1", "id0"]
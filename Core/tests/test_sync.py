@@ -0,0 +1,106 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from Core.app.commands import import_openfoodfacts
+from Core.app.main import app
+
+BARCODE = "4000000000024"
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    dump = tmp_path_factory.mktemp("dump") / "dump.jsonl"
+    dump.write_text(json.dumps({"code": BARCODE, "product_name": "Rye bread", "nutriments": {"energy-kcal_100g": 250}}) + "\n")
+    with TestClient(app) as client:
+        assert import_openfoodfacts.main([str(dump)]) == 0
+        yield client
+
+
+def _user(client):
+    email = f"sync-{uuid.uuid4().hex[:12]}@example.com"
+    credentials = {"email": email, "password": "sync-test-password"}
+    client.post("/api/v1/auth/register", json={**credentials, "name": "Sync"}).raise_for_status()
+    token = client.post("/api/v1/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _entries(count):
+    return [
+        {"id": str(uuid.uuid4()), "barcode": BARCODE, "grams": 50 + i, "scanned_at": "2025-01-01T10:00:00Z"}
+        for i in range(count)
+    ]
+
+
+def _sync(client, auth, **body):
+    resp = client.post("/api/v1/sync", json=body, headers=auth)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_reupload_of_stored_ids_is_a_no_op(client):
+    auth = _user(client)
+    entries = _entries(2)
+    first = _sync(client, auth, entries=entries)
+    again = _sync(client, auth, cursor=first["cursor"], entries=entries)
+
+    ids = [entry["id"] for entry in entries]
+    assert first["accepted"] == ids and again["accepted"] == ids
+    assert again["rejected"] == []
+    assert again["entries"] == []
+    assert again["cursor"] == first["cursor"]
+    assert len(_sync(client, auth)["entries"]) == 2
+
+
+def test_id_owned_by_another_user_is_rejected(client):
+    owner, other = _user(client), _user(client)
+    entries = _entries(1)
+    _sync(client, owner, entries=entries)
+
+    result = _sync(client, other, entries=entries)
+
+    assert result["accepted"] == []
+    assert result["rejected"] == [{"id": entries[0]["id"], "reason": "id_conflict"}]
+    assert result["entries"] == []
+
+
+def test_changes_page_with_has_more(client):
+    auth = _user(client)
+    entries = _entries(5)
+    _sync(client, auth, entries=entries)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        body = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        page = _sync(client, auth, **body)
+        pages += 1
+        assert len(page["entries"]) <= 2
+        seen += [entry["id"] for entry in page["entries"]]
+        assert cursor is None or page["cursor"] > cursor
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(entry["id"] for entry in entries)
+    assert _sync(client, auth, cursor=cursor) == {
+        "cursor": cursor, "has_more": False, "profile": None, "entries": [], "accepted": [], "rejected": []
+    }
+
+
+def test_profile_change_advances_the_cursor(client):
+    auth = _user(client)
+    initial = _sync(client, auth)
+    assert initial["profile"]["name"] == "Sync"
+
+    unchanged = _sync(client, auth, cursor=initial["cursor"])
+    assert unchanged["profile"] is None
+
+    client.patch("/api/v1/users/me", json={"name": "Renamed"}, headers=auth).raise_for_status()
+    changed = _sync(client, auth, cursor=initial["cursor"])
+
+    assert changed["cursor"] > initial["cursor"]
+    assert changed["profile"]["name"] == "Renamed"
+    assert _sync(client, auth, cursor=changed["cursor"])["profile"] is None